@@ -0,0 +1,169 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from colorama import Fore, Style, init
+
+import main
+import src.capacity as capacity
+import src.frame_cache as frame_cache
+import src.pvd as pvd
+import src.rsa as rsa
+
+init(autoreset=True)
+
+IMAGE_EXTENSIONS = {".png", ".bmp", ".tif", ".tiff"}
+REPORT_FIELDS = ["id", "cover", "output", "status", "seconds", "capacity_seconds", "payload_bytes", "capacity_bytes", "error"]
+
+def read_manifest(manifest_path):
+    """
+    Membaca manifest job (CSV dengan header, atau JSONL) berisi kolom
+    cover, message, output serta opsional id, multiframe, table.
+    """
+    with open(manifest_path, "r", newline="", encoding="utf-8") as manifest_file:
+        if manifest_path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in manifest_file if line.strip()]
+        else:
+            rows = list(csv.DictReader(manifest_file))
+    jobs = []
+    for number, row in enumerate(rows, start=1):
+        missing = [field for field in ("cover", "message", "output") if not row.get(field)]
+        if missing:
+            raise ValueError(f"Job {number} pada {manifest_path} tidak memiliki kolom: {', '.join(missing)}")
+        jobs.append({
+            "id": str(row.get("id") or number),
+            "cover": row["cover"],
+            "message": row["message"],
+            "output": row["output"],
+            "multiframe": str(row.get("multiframe", "")).lower() in ("1", "true", "yes"),
+            "table": row.get("table") or None,
+        })
+    return jobs
+
+def load_checkpoint(checkpoint_path):
+    """
+    Hasil job yang sudah tercatat di checkpoint (JSONL), {id: record}.
+    Baris terakhir yang terpotong karena crash diabaikan.
+    """
+    records = {}
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[record["id"]] = record
+    return records
+
+def append_checkpoint(checkpoint_file, record):
+    checkpoint_file.write(json.dumps(record) + "\n")
+    checkpoint_file.flush()
+    os.fsync(checkpoint_file.fileno())
+
+def init_worker():
+    # Kunci RSA dimuat sekali per worker lalu dipakai ulang oleh semua job
+    rsa.default_keyring.public_key()
+    # Kapasitas frame dipakai ulang antar job (cover yang sama, perencanaan multi-frame)
+    frame_cache.enable()
+
+def job_capacity(job):
+    # Kapasitas payload (byte) cover untuk laporan
+    if os.path.splitext(job["cover"])[1].lower() in IMAGE_EXTENSIONS:
+        return pvd.frame_capacity_bytes(pvd.load_rgb(job["cover"]), job["table"])
+    if job["multiframe"]:
+        return capacity.video_capacity(job["cover"], table=job["table"])["total_bytes"]
+    first = next(capacity.iter_frame_capacities(job["cover"], job["table"]), None)
+    if first is None:
+        raise ValueError(f"Tidak ada frame yang dapat dibaca dari video: {job['cover']}")
+    return capacity.frame_payload_bytes(first[1])
+
+def run_job(job):
+    # seconds hanya mencakup embed; pemindaian kapasitas untuk laporan dicatat terpisah
+    record = {"id": job["id"], "cover": job["cover"], "output": job["output"]}
+    start = None
+    try:
+        if not os.path.exists(job["cover"]):
+            raise FileNotFoundError(f"File cover tidak ditemukan: {job['cover']}")
+        output_dir = os.path.dirname(job["output"])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        capacity_start = time.perf_counter()
+        record["capacity_bytes"] = job_capacity(job)
+        record["capacity_seconds"] = round(time.perf_counter() - capacity_start, 4)
+        start = time.perf_counter()
+        if os.path.splitext(job["cover"])[1].lower() in IMAGE_EXTENSIONS:
+            encrypted_message = main.encrypt_image(job["cover"], job["message"], job["output"], job["table"])
+        else:
+            encrypted_message = main.encrypt_video(job["cover"], job["message"], job["output"], job["multiframe"], table=job["table"])
+        record["payload_bytes"] = len(encrypted_message)
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 4) if start is not None else 0.0
+    return record
+
+def write_report(report_path, records):
+    with open(report_path, "w", newline="", encoding="utf-8") as report_file:
+        writer = csv.DictWriter(report_file, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+def run_batch(manifest_path, workers=1, checkpoint_path=None, report_path=None):
+    """
+    Menjalankan semua job di manifest. Hasil setiap job dicatat ke checkpoint
+    segera setelah selesai sehingga job yang sudah berhasil dilewati saat
+    batch dijalankan ulang setelah crash.
+    """
+    checkpoint_path = checkpoint_path or manifest_path + ".checkpoint.jsonl"
+    jobs = read_manifest(manifest_path)
+    done = load_checkpoint(checkpoint_path)
+    pending = [job for job in jobs if done.get(job["id"], {}).get("status") != "ok"]
+    print(Fore.CYAN + f"{len(jobs)} job, {len(jobs) - len(pending)} sudah selesai, {len(pending)} dijalankan.")
+
+    def report(record):
+        done[record["id"]] = record
+        append_checkpoint(checkpoint_file, record)
+        if record["status"] == "ok":
+            print(Fore.GREEN + f"[{record['id']}] {record['output']}: {record['seconds']:.2f}s "
+                  f"(kapasitas {record['capacity_seconds']:.2f}s), "
+                  f"{record['payload_bytes']}/{record['capacity_bytes']} byte")
+        else:
+            print(Fore.RED + f"[{record['id']}] {record['cover']}: {record['error']}")
+
+    start = time.perf_counter()
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint_file:
+        if workers > 1:
+            with ProcessPoolExecutor(workers, initializer=init_worker) as executor:
+                futures = [executor.submit(run_job, job) for job in pending]
+                for future in as_completed(futures):
+                    report(future.result())
+        else:
+            init_worker()
+            for job in pending:
+                report(run_job(job))
+    elapsed = time.perf_counter() - start
+
+    records = [done[job["id"]] for job in jobs if job["id"] in done]
+    failed = sum(record["status"] != "ok" for record in records)
+    if report_path:
+        write_report(report_path, records)
+    print(Style.BRIGHT + f"Selesai dalam {elapsed:.2f}s: {len(records) - failed} berhasil, {failed} gagal.")
+    return records
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch enkripsi & steganografi PVD dari manifest (CSV/JSONL).")
+    parser.add_argument("manifest", help="File manifest berisi kolom cover, message, output")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Jumlah proses worker")
+    parser.add_argument("--checkpoint", help="File checkpoint JSONL (default: <manifest>.checkpoint.jsonl)")
+    parser.add_argument("--report", help="Tulis laporan waktu dan kapasitas per job ke CSV")
+    args = parser.parse_args()
+
+    rsa.generate_rsa_keys()
+    results = run_batch(args.manifest, args.workers, args.checkpoint, args.report)
+    if any(record["status"] != "ok" for record in results):
+        raise SystemExit(1)
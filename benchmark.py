@@ -0,0 +1,215 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import cv2
+import numpy as np
+from colorama import Fore, Style, init
+
+import main
+import src.pipeline as pipeline
+import src.pvd as pvd
+import src.pvd_engine as engine
+import src.rsa as rsa
+import src.video_parser as video_parser
+
+init(autoreset=True)
+
+BENCH_DIR = os.path.join("cache", "bench")
+RESULTS_PATH = os.path.join("output", "benchmark_results.json")
+STAGES = ["decode", "capacity", "rsa_encrypt", "embed", "encode", "transcode", "extract", "rsa_decrypt", "encrypt_video", "decrypt_video"]
+
+def synthetic_frame(rng, height, width, index):
+    # Gradien bergerak + noise: tekstur campuran area halus dan tepi seperti video asli
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = 128 + 60 * np.sin((x + index * 4) / 37.0) + 40 * np.cos((y - index * 3) / 23.0)
+    noise = rng.normal(0, 12, (height, width, 3)).astype(np.float32)
+    frame = base[..., None] + noise + np.array([-20, 0, 20], dtype=np.float32)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+def synthetic_video(width, height, duration, fps=30, seed=0, bench_dir=BENCH_DIR):
+    """
+    Membuat (sekali, lalu dipakai ulang) video cover sintetis MP4 dengan
+    resolusi dan durasi tertentu. Isi ditentukan oleh seed.
+    """
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, f"cover_{width}x{height}_{duration}s_{fps}fps_seed{seed}.mp4")
+    if not os.path.exists(path):
+        rng = np.random.default_rng(seed)
+        out = cv2.VideoWriter(path + ".tmp.mp4", cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+        for index in range(int(duration * fps)):
+            out.write(synthetic_frame(rng, height, width, index))
+        out.release()
+        os.replace(path + ".tmp.mp4", path)
+    return path
+
+def measure(function, repeats=5, warmup=1):
+    """
+    Menjalankan function warmup kali (tidak dicatat) lalu repeats kali
+    dengan perf_counter. Mengembalikan statistik dalam detik.
+    """
+    for _ in range(warmup):
+        function()
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return {
+        "runs": runs,
+        "mean": statistics.mean(runs),
+        "median": statistics.median(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "min": min(runs),
+    }
+
+def _quiet(function):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function()
+
+def benchmark_cover(video_path, message, repeats=5, warmup=1, bench_dir=BENCH_DIR):
+    """
+    Mengukur setiap tahap secara terpisah pada satu video cover. Frame tidak
+    pernah disimpan semua di memori: hanya frame pertama yang dipakai untuk
+    tahap per frame dan tahap encode, tahap transcode membaca ulang video
+    secara streaming.
+    """
+    first_frame = None
+    frame_count = 0
+    for frame in video_parser.iter_frames(video_path):
+        if first_frame is None:
+            first_frame = frame
+        frame_count += 1
+    if first_frame is None:
+        raise ValueError(f"Tidak ada frame yang dapat dibaca dari video: {video_path}")
+    pixels = video_parser.to_rgb(first_frame)
+    fps = video_parser.source_fps(video_path)
+    encrypted_message = rsa.encrypt_message_hybrid(message)
+    stego = pvd.embed_pvd_bytes_array(pixels, encrypted_message)
+    output_path = os.path.join(bench_dir, "stego.avi")
+    encode_path = os.path.join(bench_dir, "encode.avi")
+
+    stages = {
+        "decode": lambda: sum(1 for _ in video_parser.iter_frames(video_path)),
+        "capacity": lambda: engine.capacity_bits(pixels),
+        "rsa_encrypt": lambda: rsa.encrypt_message_hybrid(message),
+        "embed": lambda: pvd.embed_pvd_bytes_array(pixels, encrypted_message),
+        # VideoWriter saja: frame pertama (sudah di memori) diulang sebanyak jumlah frame
+        "encode": lambda: _quiet(lambda: video_parser.write_video(
+            itertools.repeat(first_frame, frame_count), encode_path, fps)),
+        # Decode (thread latar) + encode FFV1, seperti pipeline encrypt_video tanpa PVD
+        "transcode": lambda: _quiet(lambda: video_parser.write_video(
+            pipeline.threaded(video_parser.iter_frames(video_path)), encode_path, fps)),
+        "extract": lambda: pvd.extract_pvd_bytes_array(stego),
+        "rsa_decrypt": lambda: rsa.decrypt_message_hybrid(encrypted_message),
+        "encrypt_video": lambda: _quiet(lambda: main.encrypt_video(video_path, message, output_path, keep_audio=False)),
+        "decrypt_video": lambda: _quiet(lambda: main.decrypt_video(output_path)),
+    }
+    results = {}
+    for name in STAGES:
+        results[name] = measure(stages[name], repeats, warmup)
+        print(Fore.YELLOW + f"  {name:<14} {results[name]['median'] * 1000:10.2f} ms (median)")
+    height, width = pixels.shape[:2]
+    return {
+        "video": video_path,
+        "width": width,
+        "height": height,
+        "frame_count": frame_count,
+        "fps": fps,
+        "message_bytes": len(message.encode()),
+        "payload_bytes": len(encrypted_message),
+        "stages": results,
+    }
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+def run_benchmark(resolutions, durations, fps=30, message_bytes=1024, repeats=5, warmup=1, seed=0, bench_dir=BENCH_DIR):
+    rsa.generate_rsa_keys()
+    message = "".join(chr(ord('a') + i % 26) for i in range(message_bytes))
+    results = []
+    for width, height in resolutions:
+        for duration in durations:
+            video_path = synthetic_video(width, height, duration, fps, seed, bench_dir)
+            print(Fore.CYAN + Style.BRIGHT + f"\n[INFO] {width}x{height}, {duration}s @ {fps} fps: {video_path}")
+            results.append(benchmark_cover(video_path, message, repeats, warmup, bench_dir))
+    return {
+        "environment": environment(),
+        "config": {
+            "resolutions": [f"{width}x{height}" for width, height in resolutions],
+            "durations": durations, "fps": fps, "message_bytes": message_bytes,
+            "repeats": repeats, "warmup": warmup, "seed": seed,
+        },
+        "results": results,
+    }
+
+def plot_results(report):
+    # Grafik rata-rata waktu enkripsi/dekripsi video per cover (seperti evaluate_time.py lama)
+    import matplotlib.pyplot as plt
+
+    labels = [f"{r['width']}x{r['height']}\n{r['frame_count']} frames" for r in report["results"]]
+    x = np.arange(len(labels))
+    width = 0.35
+    fig, ax = plt.subplots()
+    for offset, stage, color in ((-width / 2, "encrypt_video", "royalblue"), (width / 2, "decrypt_video", "darkorange")):
+        means = [r["stages"][stage]["mean"] for r in report["results"]]
+        stds = [r["stages"][stage]["stdev"] for r in report["results"]]
+        ax.bar(x + offset, means, width, yerr=stds, label=stage, color=color, capsize=5)
+    ax.set_ylabel('Time (seconds)')
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels)
+    ax.set_title('Average Encryption and Decryption Times\n(with Standard Deviation)')
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per tahap (decode, kapasitas, embed, extract, encode, transcode, RSA).")
+    parser.add_argument("--resolutions", default="640x360", help="Daftar resolusi, mis. 640x360,1280x720")
+    parser.add_argument("--durations", default="1,5", help="Daftar durasi video (detik)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--message-bytes", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=RESULTS_PATH, help="File hasil JSON")
+    parser.add_argument("--plot", action="store_true", help="Tampilkan grafik waktu enkripsi/dekripsi")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        [parse_resolution(text) for text in args.resolutions.split(",")],
+        [float(text) if "." in text else int(text) for text in args.durations.split(",")],
+        args.fps, args.message_bytes, args.repeats, args.warmup, args.seed,
+    )
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w") as results_file:
+        json.dump(report, results_file, indent=2)
+    print(Fore.GREEN + Style.BRIGHT + f"\nHasil benchmark disimpan ke {args.output}")
+    if args.plot:
+        plot_results(report)
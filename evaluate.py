@@ -8,8 +8,10 @@ import numpy as np
 import src.pvd as pvd
 import src.rsa as rsa
 import src.video_parser as video_parser
+import src.frame_cache as frame_cache
+from src.frame_store import FrameStore
 
-FRAMES_DIR = os.path.join("input", "frames")
+FRAME_STORE_PATH = os.path.join("input", "frames.raw")
 OUTPUT_DIR = 'output'
 DURATIONS = [1, 5, 10, 15]
 VIDEO_PATHS = [os.path.join('input', f'{duration}_video.mp4') for duration in DURATIONS]
@@ -46,28 +48,28 @@ def psnr():
     print(Fore.YELLOW + f"PSNR value calculated: {psnr_value}")
 
 def evaluate_encrypt(video_path, message, output_video_path):
-    video_parser.extract_frames(video_path, FRAMES_DIR)
+    store = video_parser.extract_frames_to_store(video_path, FRAME_STORE_PATH)
     
     # remove directory if exists
     if os.path.exists("psnr"):
         shutil.rmtree("psnr")
     
-    # copy the first frame to /psnr
+    # save the first frame to /psnr
     os.makedirs("psnr", exist_ok=True)
-    os.makedirs(FRAMES_DIR, exist_ok=True)
-    shutil.copy(os.path.join(FRAMES_DIR, "frame_00000.png"), os.path.join("psnr", "before.png"))
+    cv2.imwrite(os.path.join("psnr", "before.png"), video_parser.to_bgr(store[0]))
     
+    # embed directly into the memory-mapped first frame
     encrypted_message = rsa.encrypt_message_base64(message)
-    image_path = os.path.join(FRAMES_DIR, "frame_00000.png")
-    bits, chars = pvd.check_pvd_capacity(image_path)
-    pvd.embed_pvd(image_path, encrypted_message, image_path)
+    bits, chars = pvd.check_pvd_capacity_array(store[0])
+    pvd.embed_pvd_array(store[0], encrypted_message, inplace=True)
     input_encrpyted_messages.append(encrypted_message)
     
-    # copy the stego frame to /psnr
-    shutil.copy(os.path.join(FRAMES_DIR, "frame_00000.png"), os.path.join("psnr", "after.png"))
+    # save the stego frame to /psnr
+    cv2.imwrite(os.path.join("psnr", "after.png"), video_parser.to_bgr(store[0]))
     psnr()
     
-    video_parser.combine_frames_to_video(FRAMES_DIR, output_video_path)
+    video_parser.store_to_video(store, output_video_path)
+    store.close()
     
     print(Fore.GREEN + Style.BRIGHT + "Kapasitas Max Bits: " + str(bits) + " | Chars: " + str(chars))
     print(Fore.CYAN + f"Pesan Terenkripsi: {encrypted_message}")
@@ -78,12 +80,11 @@ def evaluate_decrypt(stego_video_path):
         stego_video_path = "output_video.avi"
     
     # Extract frames from stego video
-    video_parser.extract_frames(stego_video_path, FRAMES_DIR)
+    store = video_parser.extract_frames_to_store(stego_video_path, FRAME_STORE_PATH)
     
     try:
-        # Extract and decrypt message from frames
-        stego_image_path = os.path.join(FRAMES_DIR, "frame_00000.png")
-        extracted_message = pvd.extract_pvd(stego_image_path)
+        # Extract and decrypt message from the memory-mapped first frame
+        extracted_message = pvd.extract_pvd_array(store[0])
         output_encrpyted_messages.append(extracted_message)
         print(Fore.CYAN + f"Pesan diekstrak (Terenkripsi): {extracted_message}")
         
@@ -92,8 +93,12 @@ def evaluate_decrypt(stego_video_path):
     except Exception as e:
         print(Fore.RED + f"Error: {e}")
         print(Fore.RED + "Pesan tidak dapat didekripsi. Kemungkinan pesan tidak valid atau rusak.")
+    finally:
+        store.close()
 
 if __name__ == "__main__":
+    frame_cache.enable()
+    
         # remove /output/evaluate_psnr_results.csv if exists
     if os.path.exists("output/evaluate_psnr_results.csv"):
         os.remove("output/evaluate_psnr_results.csv")
@@ -120,4 +125,5 @@ if __name__ == "__main__":
     print(Fore.YELLOW + f"Evaluasi selesai.")
     
     if(os.path.exists("psnr")):
-        shutil.rmtree("psnr")
\ No newline at end of file
+        shutil.rmtree("psnr")
+    FrameStore.remove(FRAME_STORE_PATH)
\ No newline at end of file
@@ -4,6 +4,7 @@ from PyQt6.QtCore import Qt
 import os
 from . import constants as c
 from .widgets import PrimaryButton, SecondaryButton, FileInput, MessageLabel
+from .worker import JobWorker
 import src.rsa as rsa
 import src.pvd as pvd
 import src.video_parser as video_parser
@@ -27,6 +28,9 @@ class MainWindow(QMainWindow):
         tabs = QTabWidget()
         main_layout.addWidget(tabs)
         
+        # Background video job (only one at a time)
+        self.video_worker = None
+        
         # Create tabs for different operations
         video_tab = self.create_video_tab()
         image_tab = self.create_image_tab()
@@ -81,14 +85,18 @@ class MainWindow(QMainWindow):
         
         # Buttons
         btn_layout = QHBoxLayout()
-        encrypt_btn = PrimaryButton("Encrypt and Hide")
-        decrypt_btn = PrimaryButton("Extract and Decrypt")
+        self.video_encrypt_btn = PrimaryButton("Encrypt and Hide")
+        self.video_decrypt_btn = PrimaryButton("Extract and Decrypt")
+        self.video_cancel_btn = SecondaryButton("Cancel")
+        self.video_cancel_btn.setEnabled(False)
         
-        encrypt_btn.clicked.connect(self.encrypt_video)
-        decrypt_btn.clicked.connect(self.decrypt_video)
+        self.video_encrypt_btn.clicked.connect(self.encrypt_video)
+        self.video_decrypt_btn.clicked.connect(self.decrypt_video)
+        self.video_cancel_btn.clicked.connect(self.cancel_video_job)
         
-        btn_layout.addWidget(encrypt_btn)
-        btn_layout.addWidget(decrypt_btn)
+        btn_layout.addWidget(self.video_encrypt_btn)
+        btn_layout.addWidget(self.video_decrypt_btn)
+        btn_layout.addWidget(self.video_cancel_btn)
         layout.addLayout(btn_layout)
         
         layout.addStretch()
@@ -150,33 +158,71 @@ class MainWindow(QMainWindow):
         layout.addStretch()
         return image_widget
     
+    def start_video_job(self, function, *args, on_success):
+        self.video_worker = JobWorker(function, *args, parent=self)
+        self.video_worker.progress.connect(self.show_video_progress)
+        self.video_worker.succeeded.connect(on_success)
+        self.video_worker.failed.connect(lambda error: self.status_label.show_error(f"Error: {error}"))
+        self.video_worker.cancelled.connect(lambda: self.status_label.show_error("Operation cancelled."))
+        self.video_worker.finished.connect(self.video_job_finished)
+        
+        self.set_video_running(True)
+        self.status_label.show_info("Starting...")
+        self.video_worker.start()
+    
+    def set_video_running(self, running):
+        self.video_encrypt_btn.setEnabled(not running)
+        self.video_decrypt_btn.setEnabled(not running)
+        self.video_cancel_btn.setEnabled(running)
+    
+    def show_video_progress(self, done, total, frames_per_second):
+        total_text = f"/{total}" if total > 0 else ""
+        self.status_label.show_info(f"Processing frame {done}{total_text} ({frames_per_second:.1f} frames/s)")
+    
+    def cancel_video_job(self):
+        if self.video_worker is not None:
+            self.video_worker.cancel()
+            self.video_cancel_btn.setEnabled(False)
+            self.status_label.show_info("Cancelling...")
+    
+    def video_job_finished(self):
+        self.set_video_running(False)
+        self.video_worker.deleteLater()
+        self.video_worker = None
+    
     def encrypt_video(self):
-        try:
-            video_path = self.video_input.text() or c.VIDEO_PATH
-            output_path = c.OUTPUT_VIDEO_PATH
-            message = self.message_input.text() or "Test message"
-            
-            main.encrypt_video(video_path, message, output_path)
-            
+        video_path = self.video_input.text() or c.VIDEO_PATH
+        output_path = c.OUTPUT_VIDEO_PATH
+        message = self.message_input.text() or "Test message"
+        
+        def on_success(_):
             self.status_label.show_success(
                 f"Message encrypted and hidden in video: {output_path}"
             )
             
             # open the output video folder
-            os.startfile(os.path.dirname(output_path))
-        except Exception as e:
-            self.status_label.show_error(f"Error: {str(e)}")
+            try:
+                os.startfile(os.path.dirname(output_path))
+            except Exception as e:
+                self.status_label.show_error(f"Error: {str(e)}")
+        
+        self.start_video_job(main.encrypt_video, video_path, message, output_path, on_success=on_success)
 
     def decrypt_video(self):
-        try:
-            video_path = self.video_input.text() or c.OUTPUT_VIDEO_PATH
-            
-            decrypted_message = main.decrypt_video(video_path)
-            
+        video_path = self.video_input.text() or c.OUTPUT_VIDEO_PATH
+        
+        def on_success(decrypted_message):
             self.message_input.setText(decrypted_message)
             self.status_label.show_success(f"Message successfully extracted and decrypted! Message: {decrypted_message}")
-        except Exception as e:
-            self.status_label.show_error(f"Error: {str(e)}")
+        
+        self.start_video_job(main.decrypt_video, video_path, on_success=on_success)
+    
+    def closeEvent(self, event):
+        # Stop a running video job before the window goes away
+        if self.video_worker is not None:
+            self.video_worker.cancel()
+            self.video_worker.wait()
+        super().closeEvent(event)
     
     def encrypt_image(self):
         try:
@@ -189,8 +235,8 @@ class MainWindow(QMainWindow):
             os.makedirs(c.OUTPUT_DIR, exist_ok=True)
             
             # Encrypt and embed
-            encrypted_message = rsa.encrypt_message_base64(message)
-            pvd.embed_pvd(image_path, encrypted_message, output_path)
+            encrypted_message = rsa.encrypt_message_hybrid(message)
+            pvd.embed_pvd_bytes(image_path, encrypted_message, output_path)
             
             self.status_label.show_success(
                 f"Message encrypted and hidden in image: {output_path}"
@@ -209,8 +255,8 @@ class MainWindow(QMainWindow):
                 return
             
             # Extract and decrypt
-            extracted_message = pvd.extract_pvd(image_path)
-            decrypted_message = rsa.decrypt_message_base64(extracted_message)
+            extracted_message = pvd.extract_pvd_bytes(image_path)
+            decrypted_message = rsa.decrypt_message(extracted_message)
             
             self.image_message_input.setText(decrypted_message)
             self.status_label.show_success("Message successfully extracted and decrypted!")
@@ -121,4 +121,19 @@ class MessageLabel(QLabel):
             }}
             """
         )
-        self.show()
\ No newline at end of file
+        self.show()
+
+    def show_info(self, message):
+        self.setText(message)
+        self.setStyleSheet(
+            f"""
+            QLabel {{
+                background-color: {c.PRIMARY_COLOR};
+                color: white;
+                padding: 8px;
+                border-radius: 4px;
+                font-size: 14px;
+            }}
+            """
+        )
+        self.show()
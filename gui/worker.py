@@ -0,0 +1,40 @@
+import threading
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+from src.pipeline import Cancelled
+
+class JobWorker(QThread):
+    """
+    Runs an embed/extract function off the UI thread. The function receives
+    the keywords progress(done, total) and cancel (a threading.Event).
+    """
+    progress = pyqtSignal(int, int, float)  # frames done, total frames, frames/second
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, function, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel_event = threading.Event()
+        self.started_at = None
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, done, total):
+        elapsed = time.perf_counter() - self.started_at
+        self.progress.emit(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+    def run(self):
+        self.started_at = time.perf_counter()
+        try:
+            result = self.function(*self.args, progress=self.report, cancel=self.cancel_event, **self.kwargs)
+        except Cancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(result)
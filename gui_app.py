@@ -1,8 +1,11 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from gui.main_window import MainWindow
+import src.frame_cache as frame_cache
 
 def main():
+    # Reuse per-frame capacity analysis across jobs
+    frame_cache.enable()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -4,6 +4,10 @@ import os
 import src.pvd as pvd
 import src.rsa as rsa
 import src.video_parser as video_parser
+import src.parallel as parallel
+import src.pipeline as pipeline
+import src.capacity as capacity
+import src.frame_cache as frame_cache
 
 # Colorama initialization
 init(autoreset=True)
@@ -15,51 +19,127 @@ OUTPUT_VIDEO_PATH = os.path.join("output", "output_video.avi")
 FRAMES_DIR = os.path.join("input", "frames")
 OUTPUT_FRAMES_DIR = os.path.join("output", "frames")
 
-def encrypt_video(video_path, message, output_video_path):
-    # Extract frames from video
-    video_parser.extract_frames(video_path, FRAMES_DIR)
+def plan_video_payload(video_path, payload, table=None, adaptive=False):
+    # Plan frame allocation from per-frame capacities (cached per video), decoding only as many frames as needed
+    capacities = (
+        (index, capacity.frame_payload_bytes(bits))
+        for index, bits in capacity.iter_frame_capacities(video_path, table)
+    )
+    if adaptive:
+        # Score every frame in one pass and keep only the highest-capacity ones; frame 0 still holds the header
+        capacities = pvd.select_frames(len(payload), capacities)
+    header, allocation = pvd.plan_multiframe(len(payload), capacities)
+    print(Fore.YELLOW + f"Payload dibagi ke {len(allocation)} frame: {[frame for frame, _, _ in allocation]}")
+    return pvd.split_payload(payload, header, allocation)
+
+def encrypt_video(video_path, message, output_video_path, multiframe=False, workers=1, table=None, keep_audio=True,
+                  depth=pipeline.DEPTH, progress=None, cancel=None, key=None, adaptive=False):
+    # Encrypt message (hybrid RSA + AES-GCM, binary)
+    encrypted_message = rsa.encrypt_message_hybrid(message)
+    
+    if multiframe or adaptive:
+        frame_payloads = plan_video_payload(video_path, encrypted_message, table, adaptive)
+    else:
+        frame_payloads = {0: encrypted_message}
     
-    # Encrypt message and embed it into frames
-    encrypted_message = rsa.encrypt_message_base64(message)
-    image_path = os.path.join(FRAMES_DIR, "frame_00000.png")
-    pvd.embed_pvd(image_path, encrypted_message, image_path)
+    # Decode, embed and encode run as overlapping stages connected by bounded queues;
+    # untouched frames pass through as decoded, source FPS and audio are kept
+    frames = pipeline.threaded(video_parser.iter_frames(video_path), depth)
+    if workers > 1:
+        frames = parallel.embed_frames(frames, frame_payloads, workers, table=table, key=key)
+    else:
+        def embed_frame(index, frame):
+            if index not in frame_payloads:
+                return frame
+            return parallel.embed_frame(frame, frame_payloads[index], table, key, index)
+        
+        frames = pipeline.stage(embed_frame, frames, depth)
     
-    # Combine frames back to video
-    video_parser.combine_frames_to_video(FRAMES_DIR, output_video_path)
+    # Report progress(frames written, total frames); cancel aborts and removes the partial output
+    if progress is not None:
+        total = video_parser.video_info(video_path)["frame_count"]
+        report = lambda done: progress(done, total)
+    else:
+        report = None
+    frames = pipeline.monitor(frames, report, cancel)
+    try:
+        count = video_parser.remux_video(video_path, output_video_path, frames, keep_audio)
+    except pvd.CapacityError as e:
+        if multiframe or adaptive:
+            raise
+        raise pvd.CapacityError(f"{e} Gunakan mode multiframe.") from e
+    if count == 0:
+        raise ValueError(f"Tidak ada frame yang dapat dibaca dari video: {video_path}")
+    missing = sorted(index for index in frame_payloads if index >= count)
+    if missing:
+        # Part of the payload was never embedded, so the output cannot be extracted
+        os.remove(output_video_path)
+        raise ValueError(f"Video hanya memiliki {count} frame, payload untuk frame {missing} tidak tersisip.")
     print(Fore.GREEN + Style.BRIGHT + "Pesan telah dienkripsi dan disisipkan ke dalam video.")
     print(Fore.YELLOW + "Pastikan pengiriman video tidak terkompresi.")
-    print(Fore.CYAN + f"Pesan Terenkripsi: {encrypted_message}")
+    print(Fore.CYAN + f"Pesan Terenkripsi ({len(encrypted_message)} byte): {encrypted_message[:32].hex()}...")
+    
+    return encrypted_message
 
-def decrypt_video(stego_video_path):
-    # Extract frames from stego video
-    video_parser.extract_frames(stego_video_path, OUTPUT_FRAMES_DIR)
+def extract_video_payload(stego_video_path, workers=1, depth=pipeline.DEPTH, progress=None, cancel=None, key=None):
+    # Decode only the first frame, which holds the payload or the multi-frame header
+    frame = video_parser.read_frame(stego_video_path, 0)
+    if frame is None:
+        raise ValueError(f"Frame tidak dapat dibaca dari video: {stego_video_path}")
+    payload = parallel.extract_frame(frame, key)
     
-    # Extract and decrypt message from frames
-    stego_image_path = os.path.join(OUTPUT_FRAMES_DIR, "frame_00000.png")
-    extracted_message = pvd.extract_pvd(stego_image_path)
-    print(Fore.CYAN + f"Pesan diekstrak (Terenkripsi): {extracted_message}")
-    decrypted_message = rsa.decrypt_message_base64(extracted_message)
+    header = pvd.parse_header(payload)
+    if header is None:
+        if progress is not None:
+            progress(1, 1)
+        return payload
+    
+    # Read only the frames listed in the header
+    payload_len, allocation, first_chunk = header
+    indices = [f for f, _, _ in allocation if f != 0]
+    frames = pipeline.threaded(video_parser.iter_selected_frames(stego_video_path, indices), depth)
+    if progress is not None:
+        progress(1, len(indices) + 1)
+        report = lambda done: progress(done + 1, len(indices) + 1)
+    else:
+        report = None
+    frames = pipeline.monitor(frames, report, cancel)
+    if workers > 1:
+        chunks = parallel.extract_frames(frames, workers, key=key)
+    else:
+        chunks = {index: parallel.extract_frame(frame, key, index) for index, frame in frames}
+    chunks[0] = first_chunk
+    return pvd.join_payload(payload_len, allocation, chunks)
+
+def decrypt_video(stego_video_path, workers=1, depth=pipeline.DEPTH, progress=None, cancel=None, key=None):
+    extracted_message = extract_video_payload(stego_video_path, workers, depth, progress, cancel, key)
+    print(Fore.CYAN + f"Pesan diekstrak (Terenkripsi, {len(extracted_message)} byte): {extracted_message[:32].hex()}...")
+    decrypted_message = rsa.decrypt_message(extracted_message)
     print(Fore.GREEN + Style.BRIGHT + f"Pesan yang diekstrak dan didekripsi: {decrypted_message}")
     
     return decrypted_message
 
-def encrypt_image(image_path, message, output_image_path):
+def encrypt_image(image_path, message, output_image_path, table=None, mode='rgb', key=None):
     if not os.path.exists(image_path):
         print(Fore.RED + Style.BRIGHT + f"File gambar tidak ditemukan: {image_path}")
         return
     
-    encrypted_message = rsa.encrypt_message_base64(message)
-    pvd.embed_pvd(image_path, encrypted_message, output_image_path)
+    encrypted_message = rsa.encrypt_message_hybrid(message)
+    pvd.embed_pvd_bytes(image_path, encrypted_message, output_image_path, table, mode, key)
     print(Fore.GREEN + Style.BRIGHT + "Pesan telah dienkripsi dan disisipkan ke dalam gambar.")
-    print(Fore.CYAN + f"Pesan: {encrypted_message}")
+    print(Fore.CYAN + f"Pesan ({len(encrypted_message)} byte): {encrypted_message[:32].hex()}...")
+    
+    return encrypted_message
             
-def decrypt_image(stego_image_path):
-    extracted_message = pvd.extract_pvd(stego_image_path)
-    decrypted_message = rsa.decrypt_message_base64(extracted_message)
+def decrypt_image(stego_image_path, mode='rgb', key=None):
+    extracted_message = pvd.extract_pvd_bytes(stego_image_path, mode=mode, key=key)
+    decrypted_message = rsa.decrypt_message(extracted_message)
     print(Fore.GREEN + Style.BRIGHT + f"Pesan yang diekstrak dan didekripsi: {decrypted_message}")
 
 def main():
     rsa.generate_rsa_keys()
+    # Reuse per-frame capacity analysis across runs (capacity checks and multi-frame planning)
+    frame_cache.enable()
     
     while True:
         print(Fore.CYAN + Style.BRIGHT + "\n=== Steganografi Video PVD dengan RSA ===")
@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from colorama import Fore, Style, init
+from PIL import UnidentifiedImageError
+
+init(autoreset=True)
+
+HOST = "127.0.0.1"
+PORT = 8080
+CHUNK_SIZE = 1 << 16
+MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+IMAGE_SUFFIX = ".png"
+VIDEO_SUFFIX = ".avi"
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Fungsi yang dijalankan di worker (proses terpisah, sudah "hangat") ---
+
+def init_worker():
+    # Import modul berat dan parsing kunci RSA sekali per worker
+    global main, capacity, pvd, rsa
+    import main
+    import src.capacity as capacity
+    import src.frame_cache as frame_cache
+    import src.pvd as pvd
+    import src.rsa as rsa
+    rsa.default_keyring.public_key()
+    rsa.default_keyring.private_key()
+    # Kapasitas frame dipakai ulang antar request (/capacity, perencanaan multi-frame)
+    frame_cache.enable()
+
+def warm_up():
+    return os.getpid()
+
+def embed_job(kind, cover_path, message, output_path, multiframe=False, table=None):
+    if kind == "image":
+        encrypted_message = main.encrypt_image(cover_path, message, output_path, table)
+    else:
+        encrypted_message = main.encrypt_video(cover_path, message, output_path, multiframe, table=table)
+    return len(encrypted_message)
+
+def extract_job(kind, stego_path):
+    if kind == "image":
+        extracted_message = pvd.extract_pvd_bytes(stego_path)
+    else:
+        extracted_message = main.extract_video_payload(stego_path)
+    return rsa.decrypt_message(extracted_message)
+
+def capacity_job(kind, cover_path, table=None, sample=None):
+    if kind == "image":
+        bits, _ = pvd.check_pvd_capacity(cover_path, table)
+        return {"frame_count": 1, "total_bits": bits, "first_frame_bytes": capacity.frame_payload_bytes(bits),
+                "total_bytes": capacity.frame_payload_bytes(bits), "estimated": False}
+    report = capacity.video_capacity(cover_path, sample, table)
+    report.pop("frames")
+    first = next(capacity.iter_frame_capacities(cover_path, table), None)
+    if first is None:
+        raise ValueError("Tidak ada frame yang dapat dibaca dari video.")
+    report["first_frame_bytes"] = capacity.frame_payload_bytes(first[1])
+    return report
+
+# --- HTTP ---
+
+async def read_request(reader):
+    """
+    Membaca request line dan header. Mengembalikan (method, path, query, headers)
+    atau None jika koneksi ditutup.
+    """
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Request line tidak valid.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return method.upper(), url.path, query, headers
+
+async def iter_body(reader, headers, max_bytes):
+    """
+    Generator async potongan body (Content-Length atau chunked) tanpa
+    menampung seluruh upload di memori.
+    """
+    received = 0
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            received += size
+            if received > max_bytes:
+                raise HTTPError(413, "Upload melebihi batas ukuran.")
+            yield await reader.readexactly(size)
+            await reader.readline()
+    else:
+        if "content-length" not in headers:
+            raise HTTPError(411, "Header Content-Length diperlukan.")
+        remaining = int(headers["content-length"])
+        if remaining > max_bytes:
+            raise HTTPError(413, "Upload melebihi batas ukuran.")
+        while remaining:
+            chunk = await reader.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise HTTPError(400, "Body terpotong.")
+            remaining -= len(chunk)
+            yield chunk
+
+async def save_body(reader, headers, path, max_bytes):
+    size = 0
+    with open(path, "wb") as upload_file:
+        async for chunk in iter_body(reader, headers, max_bytes):
+            upload_file.write(chunk)
+            size += len(chunk)
+    if size == 0:
+        raise HTTPError(400, "Body kosong, kirim file cover/stego.")
+    return size
+
+async def send_head(writer, status, content_type, length, keep_alive):
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {length}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1"))
+
+async def send_json(writer, status, data, keep_alive=True):
+    body = json.dumps(data).encode()
+    await send_head(writer, status, "application/json", len(body), keep_alive)
+    writer.write(body)
+    await writer.drain()
+
+async def send_file(writer, path, content_type, keep_alive=True):
+    await send_head(writer, 200, content_type, os.path.getsize(path), keep_alive)
+    with open(path, "rb") as output_file:
+        for chunk in iter(lambda: output_file.read(CHUNK_SIZE), b""):
+            writer.write(chunk)
+            await writer.drain()
+
+class StegoServer:
+    """
+    Layanan HTTP lokal: upload cover/stego di-stream ke file sementara lalu
+    diproses di pool worker yang sudah memuat modul dan kunci. Jumlah job
+    yang berjalan bersamaan dibatasi oleh semaphore.
+    """
+    def __init__(self, workers=None, max_concurrent=None, max_upload_bytes=MAX_UPLOAD_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(self.workers, initializer=init_worker)
+        self.limit = asyncio.Semaphore(max_concurrent or self.workers * 2)
+        self.max_upload_bytes = max_upload_bytes
+
+    async def warm_up(self):
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(self.executor, warm_up) for _ in range(self.workers)))
+        return sorted(set(pids))
+
+    async def run(self, function, *args):
+        async with self.limit:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def handle(self, method, path, query, headers, reader, writer, keep_alive):
+        if path == "/health":
+            return await send_json(writer, 200, {"status": "ok", "workers": self.workers}, keep_alive)
+        if path not in ("/embed", "/extract", "/capacity"):
+            raise HTTPError(404, f"Endpoint tidak dikenal: {path}")
+        if method != "POST":
+            raise HTTPError(405, "Gunakan POST dengan file sebagai body.")
+
+        kind = query.get("type") or ("image" if headers.get("content-type", "").startswith("image/") else "video")
+        if kind not in ("image", "video"):
+            raise HTTPError(400, "Parameter type harus image atau video.")
+        table = query.get("table") or None
+        suffix = IMAGE_SUFFIX if kind == "image" else VIDEO_SUFFIX
+        work_dir = tempfile.mkdtemp(prefix="stego_")
+        try:
+            upload_path = os.path.join(work_dir, "upload" + (IMAGE_SUFFIX if kind == "image" else ".bin"))
+            if headers.get("expect", "").lower() == "100-continue":
+                # Klien (mis. curl untuk upload > 1 MB) menunggu jawaban ini sebelum mengirim body
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                await writer.drain()
+            await save_body(reader, headers, upload_path, self.max_upload_bytes)
+            if path == "/embed":
+                if "message" not in query:
+                    raise HTTPError(400, "Parameter message diperlukan.")
+                output_path = os.path.join(work_dir, "stego" + suffix)
+                multiframe = query.get("multiframe", "").lower() in ("1", "true", "yes")
+                await self.run(embed_job, kind, upload_path, query["message"], output_path, multiframe, table)
+                await send_file(writer, output_path, "image/png" if kind == "image" else "video/x-msvideo", keep_alive)
+            elif path == "/extract":
+                message = await self.run(extract_job, kind, upload_path)
+                await send_json(writer, 200, {"message": message}, keep_alive)
+            else:
+                sample = int(query["sample"]) if query.get("sample") else None
+                await send_json(writer, 200, await self.run(capacity_job, kind, upload_path, table, sample), keep_alive)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, query, headers = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    await self.handle(method, path, query, headers, reader, writer, keep_alive)
+                except HTTPError as e:
+                    # Body yang belum terbaca membuat koneksi tidak dapat dipakai ulang
+                    await send_json(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                except (ValueError, FileNotFoundError, UnidentifiedImageError) as e:
+                    await send_json(writer, 400, {"error": f"{type(e).__name__}: {e}"}, keep_alive=False)
+                    break
+                except Exception as e:
+                    await send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"}, keep_alive=False)
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT):
+        pids = await self.warm_up()
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        print(Fore.GREEN + Style.BRIGHT + f"Layanan stego berjalan di http://{host}:{port} ({len(pids)} worker siap)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Layanan HTTP lokal untuk embed/extract/capacity PVD.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("-w", "--workers", type=int, help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument("--max-concurrent", type=int, help="Job berjalan bersamaan (default: 2 x worker)")
+    parser.add_argument("--max-upload-mb", type=int, default=MAX_UPLOAD_BYTES // (1024 * 1024))
+    args = parser.parse_args()
+
+    import src.rsa as rsa
+    rsa.generate_rsa_keys()
+    stego_server = StegoServer(args.workers, args.max_concurrent, args.max_upload_mb * 1024 * 1024)
+    try:
+        asyncio.run(stego_server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(Fore.MAGENTA + "Layanan dihentikan.")
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import math
+import os
+import tempfile
+
+import numpy as np
+
+import src.pvd as pvd
+import src.pvd_engine as engine
+import src.pvd_tables as pvd_tables
+import src.video_parser as video_parser
+
+CACHE_DIR = os.path.join("cache", "capacity")
+
+# Hash video per (path, mtime, ukuran) agar file yang sama tidak di-hash ulang
+_hash_memo = {}
+
+def video_hash(video_path, chunk_size=1 << 20):
+    """
+    SHA-256 isi file video, dipakai sebagai kunci cache kapasitas.
+    """
+    stat = os.stat(video_path)
+    memo_key = (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(video_path, "rb") as video_file:
+            for chunk in iter(lambda: video_file.read(chunk_size), b""):
+                digest.update(chunk)
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+def _cache_path(video_path, table, cache_dir):
+    return os.path.join(cache_dir, f"{video_hash(video_path)}_{pvd_tables.get_table(table).name}.json")
+
+def load_cache(video_path, table=None, cache_dir=CACHE_DIR):
+    """
+    Membaca kapasitas per frame (bit) dari cache. Mengembalikan
+    (dict {indeks: bit}, jumlah frame atau None jika belum diketahui).
+    """
+    path = _cache_path(video_path, table, cache_dir)
+    try:
+        with open(path, "r") as cache_file:
+            data = json.load(cache_file)
+        return {int(index): bits for index, bits in data["frames"].items()}, data.get("frame_count")
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        # Cache rusak atau terhapus oleh proses lain: anggap cache miss
+        return {}, None
+
+def save_cache(video_path, frames, frame_count=None, table=None, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(video_path, table, cache_dir)
+    # File sementara unik per penulis agar beberapa worker dapat menulis cache cover yang sama
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as cache_file:
+            json.dump({"frame_count": frame_count, "frames": {str(i): bits for i, bits in sorted(frames.items())}}, cache_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def frame_payload_bytes(bits):
+    # Kapasitas payload satu frame setelah dikurangi header
+    return max(0, bits // 8 - pvd.HEADER.size)
+
+def iter_frame_capacities(video_path, table=None, cache_dir=CACHE_DIR):
+    """
+    Generator (indeks frame, kapasitas bit) berurutan. Prefix frame yang sudah
+    ada di cache tidak didekode; frame baru dihitung lalu disimpan ke cache
+    saat generator selesai atau ditutup.
+    """
+    frames, frame_count = load_cache(video_path, table, cache_dir)
+    known_count = frame_count
+    added = 0
+    index = 0
+    try:
+        while index in frames:
+            yield index, frames[index]
+            index += 1
+        if frame_count is None or index < frame_count:
+            for frame_index, frame in video_parser.iter_frames_from(video_path, index):
+                if frame_index not in frames:
+                    frames[frame_index] = engine.capacity_bits(video_parser.to_rgb(frame), table)
+                    added += 1
+                yield frame_index, frames[frame_index]
+                index = frame_index + 1
+            frame_count = index
+    finally:
+        if added or frame_count != known_count:
+            save_cache(video_path, frames, frame_count, table, cache_dir)
+
+def video_capacity(video_path, sample=None, table=None, cache_dir=CACHE_DIR):
+    """
+    Kapasitas per frame dan total untuk seluruh video.
+    sample=N hanya mengukur N frame tersebar merata lalu mengestimasi total
+    dengan interval kepercayaan 95%.
+    """
+    if sample is None:
+        frames = dict(iter_frame_capacities(video_path, table, cache_dir))
+        total = sum(frames.values())
+        total_bytes = sum(frame_payload_bytes(bits) for bits in frames.values())
+        return {
+            "frame_count": len(frames),
+            "frames": frames,
+            "estimated": False,
+            "total_bits": total,
+            "lower_bits": total,
+            "upper_bits": total,
+            "total_bytes": total_bytes,
+        }
+
+    frames, cached_count = load_cache(video_path, table, cache_dir)
+    frame_count = cached_count or video_parser.video_info(video_path)["frame_count"]
+    indices = np.unique(np.linspace(0, max(frame_count - 1, 0), min(sample, frame_count)).astype(int)).tolist()
+    missing = [index for index in indices if index not in frames]
+    for index, frame in video_parser.iter_selected_frames(video_path, missing):
+        frames[index] = engine.capacity_bits(video_parser.to_rgb(frame), table)
+    if missing:
+        save_cache(video_path, frames, cached_count, table, cache_dir)
+
+    measured = np.array([frames[index] for index in indices if index in frames], dtype=np.float64)
+    if len(measured) == 0:
+        raise ValueError(f"Tidak ada frame yang dapat dibaca dari video: {video_path}")
+    n = len(measured)
+    mean = measured.mean()
+    # Standard error dengan koreksi populasi terbatas
+    spread = measured.std(ddof=1) if n > 1 else 0.0
+    correction = math.sqrt((frame_count - n) / (frame_count - 1)) if frame_count > 1 else 0.0
+    margin = 1.96 * spread / math.sqrt(n) * correction * frame_count
+    total = mean * frame_count
+    return {
+        "frame_count": frame_count,
+        "frames": {index: frames[index] for index in indices if index in frames},
+        "estimated": n < frame_count,
+        "total_bits": int(round(total)),
+        "lower_bits": int(max(measured.sum(), total - margin)),
+        "upper_bits": int(total + margin),
+        "total_bytes": int(frame_count * np.mean([frame_payload_bytes(int(bits)) for bits in measured])),
+    }
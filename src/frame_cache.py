@@ -0,0 +1,93 @@
+import hashlib
+import os
+
+import numpy as np
+
+import src.pvd_engine as engine
+
+CACHE_DIR = os.path.join("cache", "frames")
+MAX_ENTRIES = 100_000
+
+class FrameCache:
+    """
+    Cache kapasitas PVD per frame (total bit), satu file kecil per frame.
+    Kunci berupa hash isi frame + tabel range; entri paling lama tidak
+    dipakai dihapus saat jumlah entri melewati max_entries (LRU berdasarkan
+    mtime). Jumlah entri dihitung sekali lalu dilacak saat menulis.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.entries = None
+
+    def key(self, pixels, table):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{pixels.shape}|{pixels.dtype}|{table.name}".encode())
+        digest.update(np.ascontiguousarray(pixels).data)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bits")
+
+    def load(self, key):
+        """
+        Mengembalikan kapasitas frame (bit), atau None.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as cache_file:
+                bits = int(cache_file.read())
+            os.utime(path)  # Tandai baru dipakai untuk LRU
+        except (FileNotFoundError, ValueError):
+            return None
+        return bits
+
+    def _count(self):
+        if self.entries is None:
+            self.entries = sum(1 for entry in os.scandir(self.cache_dir) if entry.name.endswith(".bits"))
+        return self.entries
+
+    def store(self, key, bits):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        entries = self._count() + (not os.path.exists(path))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as cache_file:
+            cache_file.write(str(int(bits)))
+        os.replace(tmp_path, path)
+        self.entries = entries
+        if self.entries > self.max_entries:
+            self.evict()
+
+    def evict(self):
+        # Hapus entri lama sampai tersisa separuh batas agar pemindaian direktori jarang terjadi
+        entries = sorted(
+            (entry.stat().st_mtime_ns, entry.path)
+            for entry in os.scandir(self.cache_dir) if entry.name.endswith(".bits")
+        )
+        keep = self.max_entries // 2
+        for _, path in entries[:max(0, len(entries) - keep)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.entries = min(len(entries), keep)
+
+    def clear(self):
+        if os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".bits"):
+                    os.remove(entry.path)
+        self.entries = 0
+
+def enable(cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES):
+    """
+    Mengaktifkan cache kapasitas frame untuk pvd_engine.capacity_bits
+    (opt-in; nonaktif secara default).
+    """
+    cache = FrameCache(cache_dir, max_entries)
+    engine.set_analysis_cache(cache)
+    return cache
+
+def disable():
+    engine.set_analysis_cache(None)
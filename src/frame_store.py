@@ -0,0 +1,68 @@
+import json
+import os
+
+import numpy as np
+
+class FrameStore:
+    """
+    Penyimpanan frame tanpa kompresi dalam satu file: frame RGB uint8
+    berukuran tetap (H x W x 3) disusun berurutan, dengan index JSON di
+    <path>.json. Frame dibaca/diubah langsung lewat np.memmap.
+    """
+    def __init__(self, path, mode='r'):
+        with open(self.index_path(path), "r") as index_file:
+            self.index = json.load(index_file)
+        self.path = path
+        self.fps = self.index["fps"]
+        shape = (self.index["frame_count"], self.index["height"], self.index["width"], 3)
+        self.frames = np.memmap(path, dtype=np.uint8, mode=mode, shape=shape)
+
+    @staticmethod
+    def index_path(path):
+        return path + ".json"
+
+    @classmethod
+    def write(cls, path, frames, fps=30):
+        """
+        Menulis iterable frame RGB ke file store baru, lalu membukanya (r+).
+        """
+        count = 0
+        height = width = 0
+        with open(path, "wb") as store_file:
+            for frame in frames:
+                if count == 0:
+                    height, width = frame.shape[:2]
+                elif frame.shape[:2] != (height, width):
+                    raise ValueError(f"Ukuran frame {count} berbeda: {frame.shape[:2]}")
+                store_file.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+                count += 1
+        if count == 0:
+            raise ValueError("Tidak ada frame untuk disimpan.")
+        index = {"frame_count": count, "height": height, "width": width, "fps": fps, "order": "RGB"}
+        with open(cls.index_path(path), "w") as index_file:
+            json.dump(index, index_file)
+        return cls(path, mode='r+')
+
+    def __len__(self):
+        return self.frames.shape[0]
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.frames[index]
+
+    def flush(self):
+        if self.frames.mode != 'r':
+            self.frames.flush()
+
+    def close(self):
+        self.flush()
+        del self.frames
+
+    @staticmethod
+    def remove(path):
+        for file_path in (path, FrameStore.index_path(path)):
+            if os.path.exists(file_path):
+                os.remove(file_path)
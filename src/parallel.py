@@ -0,0 +1,69 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import src.pvd as pvd
+import src.video_parser as video_parser
+
+# Pool dibuat saat thread decoder pipeline sudah berjalan; fork dari proses
+# multi-thread (cv2 bisa sedang di tengah pemanggilan) dapat deadlock, jadi pakai spawn
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Fungsi untuk menyisipkan payload bytes ke satu frame BGR (dijalankan di worker)
+def embed_frame(frame, payload, table=None, key=None, index=0):
+    # Kapasitas tidak dihitung terpisah: penyisipan hanya menganalisis prefix yang dibutuhkan payload
+    pixels = video_parser.to_rgb(frame)
+    try:
+        stego = pvd.embed_pvd_bytes_array(pixels, payload, table, inplace=True, key=key, frame=index)
+    except pvd.CapacityError as e:
+        raise pvd.CapacityError(f"Payload {len(payload)} byte melebihi kapasitas frame {index}.") from e
+    return video_parser.to_bgr(stego)
+
+# Fungsi untuk mengekstrak payload bytes dari satu frame BGR (dijalankan di worker)
+def extract_frame(frame, key=None, index=0):
+    return pvd.extract_pvd_bytes_array(video_parser.to_rgb(frame), key=key, frame=index)
+
+def completed(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+def ordered_results(futures, max_pending):
+    """
+    Reorder buffer: menghasilkan hasil future sesuai urutan submit.
+    futures dibaca secara lazy sehingga paling banyak max_pending
+    frame berada di memori pada satu waktu.
+    """
+    buffer = deque()
+    for future in futures:
+        buffer.append(future)
+        if len(buffer) >= max_pending:
+            yield buffer.popleft().result()
+    while buffer:
+        yield buffer.popleft().result()
+
+def embed_frames(frames, frame_payloads, workers, max_pending=None, table=None, key=None):
+    """
+    Menyisipkan payload ke frame yang ada di frame_payloads secara paralel.
+    Frame lain diteruskan apa adanya; urutan output sama dengan input.
+    """
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(workers, mp_context=MP_CONTEXT) as executor:
+        futures = (
+            executor.submit(embed_frame, frame, frame_payloads[index], table, key, index) if index in frame_payloads else completed(frame)
+            for index, frame in enumerate(frames)
+        )
+        yield from ordered_results(futures, max_pending)
+
+def _extract_indexed(index, frame, key=None):
+    return index, extract_frame(frame, key, index)
+
+def extract_frames(indexed_frames, workers, max_pending=None, key=None):
+    """
+    Mengekstrak payload dari iterable (indeks, frame) secara paralel.
+    Mengembalikan dict {indeks: bytes}.
+    """
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(workers, mp_context=MP_CONTEXT) as executor:
+        futures = (executor.submit(_extract_indexed, index, frame, key) for index, frame in indexed_frames)
+        return dict(ordered_results(futures, max_pending))
@@ -0,0 +1,93 @@
+import queue
+import threading
+
+# Jumlah item maksimum di antrean antar tahap (backpressure)
+DEPTH = 8
+
+_ITEM, _DONE, _ERROR = range(3)
+
+class Cancelled(Exception):
+    pass
+
+def _put(items, stop, entry):
+    # put() yang tetap bisa dihentikan saat konsumen sudah berhenti membaca
+    while not stop.is_set():
+        try:
+            items.put(entry, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def threaded(iterable, depth=DEPTH):
+    """
+    Menjalankan iterable sebagai tahap pipeline di thread terpisah dan
+    menghasilkan itemnya lewat antrean berukuran depth. Producer berhenti
+    menunggu saat antrean penuh sehingga memori tetap datar; exception di
+    producer diteruskan ke konsumen. depth=0 berarti tanpa thread.
+    """
+    if not depth:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not _put(items, stop, (_ITEM, item)):
+                    return
+            _put(items, stop, (_DONE, None))
+        except BaseException as error:
+            _put(items, stop, (_ERROR, error))
+        finally:
+            # Generator sumber (mis. VideoCapture) ditutup di thread pemiliknya
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        stop.set()
+        thread.join()
+
+def stage(function, iterable, depth=DEPTH):
+    """
+    Tahap pipeline yang menerapkan function(index, item) ke setiap item.
+    """
+    def apply():
+        try:
+            for index, item in enumerate(iterable):
+                yield function(index, item)
+        finally:
+            # Hentikan juga tahap sebelumnya saat tahap ini selesai atau gagal
+            if hasattr(iterable, "close"):
+                iterable.close()
+
+    return threaded(apply(), depth)
+
+def monitor(iterable, progress=None, cancel=None):
+    """
+    Meneruskan item sambil memanggil progress(jumlah selesai) setiap item dan
+    menghentikan pipeline dengan Cancelled saat cancel (threading.Event) di-set.
+    """
+    try:
+        for count, item in enumerate(iterable, start=1):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled("Proses dibatalkan.")
+            yield item
+            if progress is not None:
+                progress(count)
+    finally:
+        if hasattr(iterable, "close"):
+            iterable.close()
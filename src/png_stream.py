@@ -0,0 +1,74 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Tipe filter baris PNG "Sub": selisih byte dengan piksel di kirinya
+FILTER_SUB = 1
+
+class PNGWriter:
+    """
+    Penulis PNG 8-bit (grayscale atau RGB) secara bertahap: baris ditulis per
+    band dan langsung dikompresi ke chunk IDAT, sehingga gambar utuh tidak
+    pernah berada di memori.
+    """
+    def __init__(self, path, width, height, channels=3, level=6):
+        if channels not in (1, 3):
+            raise ValueError("PNGWriter hanya mendukung 1 (grayscale) atau 3 (RGB) channel.")
+        self.path = path
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.rows = 0
+        self.compressor = zlib.compressobj(level)
+        self.file = open(path, "wb")
+        self.file.write(PNG_SIGNATURE)
+        color_type = 2 if channels == 3 else 0
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+
+    def _chunk(self, tag, data):
+        self.file.write(struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data)))
+
+    def write_rows(self, rows):
+        rows = np.asarray(rows, dtype=np.uint8)
+        if rows.shape[1] != self.width or (rows.ndim == 3 and rows.shape[2] != self.channels):
+            raise ValueError(f"Ukuran baris {rows.shape} tidak sesuai dengan gambar {self.width}x{self.height}.")
+        if self.rows + len(rows) > self.height:
+            raise ValueError("Jumlah baris melebihi tinggi gambar.")
+        raw = rows.reshape(len(rows), -1)
+        filtered = np.empty((len(rows), raw.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = FILTER_SUB
+        filtered[:, 1:self.channels + 1] = raw[:, :self.channels]
+        np.subtract(raw[:, self.channels:], raw[:, :-self.channels], out=filtered[:, self.channels + 1:])
+        data = self.compressor.compress(filtered.tobytes())
+        if data:
+            self._chunk(b'IDAT', data)
+        self.rows += len(rows)
+
+    def close(self):
+        if self.file is None:
+            return
+        try:
+            if self.rows != self.height:
+                raise ValueError(f"PNG belum lengkap: {self.rows} dari {self.height} baris ditulis.")
+            self._chunk(b'IDAT', self.compressor.flush())
+            self._chunk(b'IEND', b'')
+        finally:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            # PNG yang terpotong tidak berguna, hapus
+            self.file.close()
+            self.file = None
+            os.remove(self.path)
+            return False
+        self.close()
+        return False
@@ -1,115 +1,295 @@
+import heapq
 import os
 from PIL import Image
-import math
+import struct
+import zlib
+import numpy as np
+
+import src.pvd_engine as engine
+import src.pvd_tables as pvd_tables
+from src.png_stream import PNGWriter
 
 # Fungsi untuk menentukan range dan kapasitas bit
-def get_range_and_bits(d):
-    ranges = [(0, 7), (8, 15), (16, 31), (32, 63), (64, 127), (128, 255)]
-    for (lower, upper) in ranges:
-        if lower <= d <= upper:
-            return (lower, upper, int(math.floor(math.log2(upper - lower + 1))))
-    return (0, 0, 0)
+def get_range_and_bits(d, table=None):
+    if not 0 <= d <= 255:
+        return (0, 0, 0)
+    return pvd_tables.get_table(table).lookup(d)
 
-# Fungsi untuk menyisipkan pesan ke gambar RGB
-def embed_pvd(image_path, message, output_path='stego_rgb.png'):
-    img = Image.open(image_path).convert('RGB')
-    pixels = list(img.getdata())
+# Header payload: magic, versi, panjang payload, CRC32 payload
+MAGIC = b'PVDF'
+VERSION = 1
+HEADER = struct.Struct('>4sBII')
+HEADER_BITS = HEADER.size * 8
+
+# Terminator format lama (sebelum header panjang), hanya untuk ekstraksi
+TERMINATOR = b'\xff'
+
+class CapacityError(ValueError):
+    """Payload tidak muat di gambar/frame pembawa."""
+
+# Fungsi untuk mengubah teks menjadi bytes
+def encode_message(message):
+    return message.encode('utf-8')
+
+# Fungsi untuk mengubah bytes hasil ekstraksi menjadi teks
+def decode_message(data):
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        # Gambar lama menyimpan karakter sebagai satu byte (latin-1)
+        return data.decode('latin-1')
 
-    binary_msg = ''.join([format(ord(c), '08b') for c in message]) + '11111111'  # Terminator
-    msg_index = 0
+# Fungsi untuk membungkus bytes dengan header lalu mengubahnya menjadi array bit
+def bytes_to_bits(data):
+    header = HEADER.pack(MAGIC, VERSION, len(data), zlib.crc32(data))
+    return engine.unpack_bits(header + data)
 
-    new_pixels = []
+def load_rgb(image_path):
+    return load_pixels(image_path, 'rgb')
 
-    for i in range(0, len(pixels)-1, 2):
-        if msg_index >= len(binary_msg):
-            new_pixels.extend(pixels[i:])
+# Gambar cover/stego untuk mode tertentu: grayscale (HxW) untuk mode gray, selain itu RGB
+def load_pixels(image_path, mode='rgb'):
+    target = 'L' if mode == 'gray' else 'RGB'
+    with Image.open(image_path) as image:
+        # Tanpa convert() jika mode sudah sesuai, agar gambar besar tidak disalin dua kali
+        if image.mode != target:
+            image = image.convert(target)
+        return np.asarray(image)
+
+def save_image(pixels, output_path):
+    Image.fromarray(pixels, 'L' if pixels.ndim == 2 else 'RGB').save(output_path)
+
+# Fungsi untuk menyisipkan bytes ke array piksel RGB (HxWx3) atau grayscale (HxW)
+def embed_pvd_bytes_array(pixels, data, table=None, inplace=False, mode='rgb', key=None, frame=0):
+    bits = bytes_to_bits(data)
+    stego, embedded = engine.embed_bits(pixels, bits, table, inplace, mode, key, frame)
+    if embedded < len(bits):
+        raise CapacityError(f"Payload {len(data)} byte melebihi kapasitas gambar.")
+    return stego
+
+# Fungsi untuk mengekstrak bytes format lama secara bertahap sampai terminator
+def extract_stream(pixels, table=None, mode='rgb'):
+    chunks = []
+    for chunk in engine.iter_bytes(pixels, table=table, mode=mode):
+        end = chunk.find(TERMINATOR)
+        if end != -1:
+            chunks.append(chunk[:end])
             break
+        chunks.append(chunk)
+    return b''.join(chunks)
 
-        p1 = list(pixels[i])
-        p2 = list(pixels[i+1])
+def read_header(pixels, table=None, mode='rgb', band_rows=None, key=None, frame=0):
+    """
+    Membaca header payload dari awal gambar (atau awal urutan kunci).
+    Mengembalikan (panjang, crc) atau None jika gambar memakai format lama.
+    """
+    bits = engine.read_bits(pixels, HEADER_BITS, table=table, mode=mode, band_rows=band_rows, key=key, frame=frame)
+    magic, version, length, crc = HEADER.unpack(engine.pack_bits(bits).ljust(HEADER.size, b'\0'))
+    if magic != MAGIC or version != VERSION:
+        return None
+    return length, crc
 
-        for channel in range(3):  # R, G, B
-            if msg_index >= len(binary_msg):
-                break
+# Fungsi untuk membaca payload setelah header diketahui
+def read_payload(pixels, header, table=None, mode='rgb', band_rows=None, key=None, frame=0):
+    # Panjang sudah diketahui: dekode hanya sampai pasangan terakhir yang dibutuhkan
+    length, crc = header
+    total_bits = HEADER_BITS + length * 8
+    bits = engine.read_bits(pixels, total_bits, table=table, mode=mode, band_rows=band_rows, key=key, frame=frame)
+    if len(bits) < total_bits:
+        raise ValueError("Header rusak: panjang payload melebihi kapasitas gambar.")
+    data = engine.pack_bits(bits[HEADER_BITS:])
+    if zlib.crc32(data) != crc:
+        raise ValueError("Checksum payload tidak cocok, data rusak.")
+    return data
+
+# Fungsi untuk mengekstrak bytes dari array piksel RGB (HxWx3) atau grayscale (HxW)
+def extract_pvd_bytes_array(pixels, streaming=True, table=None, mode='rgb', band_rows=None, key=None, frame=0):
+    # Tanpa tabel eksplisit, coba setiap tabel range sampai header dan checksum cocok
+    if table is None:
+        tables = list(pvd_tables.TABLES.values())
+    else:
+        tables = [pvd_tables.get_table(table)]
+    error = None
+    for candidate in tables:
+        header = read_header(pixels, candidate, mode, band_rows, key, frame)
+        if header is None:
+            continue
+        try:
+            return read_payload(pixels, header, candidate, mode, band_rows, key, frame)
+        except ValueError as e:
+            error = e
+    if error is not None:
+        raise error
+    if key is not None:
+        raise ValueError("Header tidak ditemukan: kunci urutan pasangan salah atau gambar tidak berisi pesan.")
 
-            d = abs(p2[channel] - p1[channel])
-            r_lower, _, bits = get_range_and_bits(d)
-            if bits == 0:
-                continue
+    # Format lama tanpa header: berhenti di terminator
+    if streaming:
+        return extract_stream(pixels, table, mode)
+    data = engine.pack_bits(engine.extract_bits(pixels, table, mode))
+    return data.split(TERMINATOR, 1)[0]
 
-            segment = binary_msg[msg_index: msg_index + bits]
-            if len(segment) < bits:
-                segment += '0' * (bits - len(segment))
+# Fungsi untuk menyisipkan pesan teks ke array piksel RGB (HxWx3)
+def embed_pvd_array(pixels, message, table=None, inplace=False, mode='rgb', key=None):
+    return embed_pvd_bytes_array(pixels, encode_message(message), table, inplace, mode, key)
 
-            msg_index += bits
-            m = int(segment, 2)
-            new_d = r_lower + m
+# Fungsi untuk mengekstrak pesan teks dari array piksel RGB (HxWx3)
+def extract_pvd_array(pixels, streaming=True, table=None, mode='rgb', key=None):
+    return decode_message(extract_pvd_bytes_array(pixels, streaming, table, mode, key=key))
 
-            if p2[channel] >= p1[channel]:
-                p1_new = round((p1[channel] + p2[channel] - new_d) / 2)
-                p2_new = p1_new + new_d
-            else:
-                p1_new = round((p1[channel] + p2[channel] + new_d) / 2)
-                p2_new = p1_new - new_d
+def embed_pvd_bytes(image_path, data, output_path='stego_rgb.png', table=None, mode='rgb', key=None):
+    stego = embed_pvd_bytes_array(load_pixels(image_path, mode), data, table, mode=mode, key=key)
+    save_image(stego, output_path)
 
-            # Validasi batas
-            if p1_new < 0:
-                p2_new += abs(p1_new)
-                p1_new = 0
-            elif p2_new > 255:
-                p1_new -= (p2_new - 255)
-                p2_new = 255
+def extract_pvd_bytes(stego_path, streaming=True, table=None, mode='rgb', key=None):
+    return extract_pvd_bytes_array(load_pixels(stego_path, mode), streaming, table, mode, key=key)
 
-            p1[channel] = max(0, min(255, p1_new))
-            p2[channel] = max(0, min(255, p2_new))
+def embed_pvd_bytes_tiled(image_path, data, output_path='stego_rgb.png', table=None, mode='rgb', band_rows=engine.BAND_ROWS):
+    """
+    Versi bertahap embed_pvd_bytes untuk gambar sangat besar: penyisipan
+    dilakukan per band baris dan hasilnya langsung ditulis ke PNG.
+    """
+    pixels = load_pixels(image_path, mode)
+    bits = bytes_to_bits(data)
+    channels = 1 if mode == 'gray' or pixels.ndim == 2 else 3
+    embedded = 0
+    with PNGWriter(output_path, pixels.shape[1], pixels.shape[0], channels) as writer:
+        for band, embedded in engine.iter_embed_bands(pixels, bits, table, mode, band_rows):
+            writer.write_rows(band)
+    if embedded < len(bits):
+        os.remove(output_path)
+        raise CapacityError(f"Payload {len(data)} byte melebihi kapasitas gambar.")
 
-        new_pixels.append(tuple(p1))
-        new_pixels.append(tuple(p2))
+def extract_pvd_bytes_tiled(stego_path, table=None, mode='rgb', band_rows=engine.BAND_ROWS):
+    return extract_pvd_bytes_array(load_pixels(stego_path, mode), table=table, mode=mode, band_rows=band_rows)
 
-    img.putdata(new_pixels)
-    img.save(output_path)
+# Fungsi untuk menyisipkan pesan ke gambar RGB
+def embed_pvd(image_path, message, output_path='stego_rgb.png', table=None, mode='rgb', key=None):
+    stego = embed_pvd_array(load_pixels(image_path, mode), message, table, mode=mode, key=key)
+    save_image(stego, output_path)
 
 # Fungsi untuk mengekstrak pesan dari gambar RGB
-def extract_pvd(stego_path):
+def extract_pvd(stego_path, streaming=True, table=None, mode='rgb', key=None):
     print("Ekstraksi pesan dari gambar...")
-    img = Image.open(stego_path).convert('RGB')
-    pixels = list(img.getdata())
-    print(f"Jumlah pixel: {len(pixels)}")
-
-    bits = ''
-    for i in range(0, len(pixels)-1, 2):
-        p1 = pixels[i]
-        p2 = pixels[i+1]
-
-        for channel in range(3):
-            d = abs(p2[channel] - p1[channel])
-            r_lower, _, nbits = get_range_and_bits(d)
-            if nbits > 0:
-                m = d - r_lower
-                bits += format(m, f'0{nbits}b')
-
-    chars = [bits[i:i+8] for i in range(0, len(bits), 8)]
-    message = ''
-    for c in chars:
-        if c == '11111111':
-            break
-        message += chr(int(c, 2))
-    return message
-
-# Cek kapasitas maksimum RGB
-def check_pvd_capacity(image_path):
-    img = Image.open(image_path).convert('RGB')
-    pixels = list(img.getdata())
-    total_bits = 0
-    for i in range(0, len(pixels)-1, 2):
-        p1, p2 = pixels[i], pixels[i+1]
-        for channel in range(3):
-            d = abs(p2[channel] - p1[channel])
-            _, _, bits = get_range_and_bits(d)
-            total_bits += bits
+    pixels = load_pixels(stego_path, mode)
+    print(f"Jumlah pixel: {pixels.shape[0] * pixels.shape[1]}")
+    return extract_pvd_array(pixels, streaming, table, mode, key)
+
+# Cek kapasitas maksimum dari array piksel
+def check_pvd_capacity_array(pixels, table=None, mode='rgb'):
+    total_bits = engine.capacity_bits(pixels, table, mode)
     total_chars = total_bits // 8
     return total_bits, total_chars
 
+# Cek kapasitas maksimum gambar
+def check_pvd_capacity(image_path, table=None, mode='rgb'):
+    return check_pvd_capacity_array(load_pixels(image_path, mode), table, mode)
+
+# Header multi-frame: magic, panjang payload, jumlah frame, lalu (frame, awal, akhir) per frame
+MULTIFRAME_MAGIC = b'PVDM'
+MULTIFRAME_HEADER = struct.Struct('>4sII')
+MULTIFRAME_ENTRY = struct.Struct('>III')
+
+# Kapasitas payload (byte) satu frame setelah dikurangi header
+def frame_capacity_bytes(pixels, table=None, mode='rgb'):
+    return max(0, engine.capacity_bits(pixels, table, mode) // 8 - HEADER.size)
+
+def build_header(payload_len, allocation):
+    header = MULTIFRAME_HEADER.pack(MULTIFRAME_MAGIC, payload_len, len(allocation))
+    return header + b''.join(MULTIFRAME_ENTRY.pack(*entry) for entry in allocation)
+
+def parse_header(data):
+    """
+    Mengurai header multi-frame dari payload frame pertama.
+    Mengembalikan (panjang payload, alokasi, potongan payload di frame pertama)
+    atau None jika payload bukan pesan multi-frame.
+    """
+    if len(data) < MULTIFRAME_HEADER.size or not data.startswith(MULTIFRAME_MAGIC):
+        return None
+    _, payload_len, count = MULTIFRAME_HEADER.unpack_from(data)
+    offset = MULTIFRAME_HEADER.size
+    allocation = [MULTIFRAME_ENTRY.unpack_from(data, offset + i * MULTIFRAME_ENTRY.size) for i in range(count)]
+    return payload_len, allocation, data[offset + count * MULTIFRAME_ENTRY.size:]
+
+def plan_multiframe(payload_len, capacities):
+    """
+    Membagi payload ke beberapa frame secara berurutan.
+    capacities adalah iterable (indeks frame, kapasitas byte); entri
+    pertama adalah frame header dan hanya dikonsumsi sebanyak yang dibutuhkan.
+    Mengembalikan (header, [(frame, awal, akhir), ...]).
+    """
+    source = iter(capacities)
+    seen = []
+    header_len = 0
+    while True:
+        allocation = []
+        position = 0
+        i = 0
+        while i == 0 or position < payload_len:
+            if i == len(seen):
+                item = next(source, None)
+                if item is None:
+                    raise ValueError(f"Kapasitas tidak cukup untuk {payload_len} byte.")
+                seen.append(item)
+            frame, capacity = seen[i]
+            if i == 0:
+                capacity -= header_len
+            take = max(0, min(capacity, payload_len - position))
+            if take > 0:
+                allocation.append((frame, position, position + take))
+                position += take
+            i += 1
+        header = build_header(payload_len, allocation)
+        if len(header) <= header_len:
+            if len(header) > seen[0][1]:
+                raise ValueError("Header multi-frame tidak muat di frame pertama.")
+            return header, allocation
+        header_len = len(header)
+
+def select_frames(payload_len, capacities, header_frame=0):
+    """
+    Memilih frame dengan kapasitas terbesar dalam satu kali lintasan.
+    capacities adalah iterable (indeks frame, kapasitas byte). Frame header
+    selalu dipakai; frame lain disimpan di min-heap dan frame terkecil
+    dibuang selama sisanya masih cukup untuk payload beserta header
+    multi-frame, sehingga jumlah frame yang dipakai minimal.
+    Mengembalikan [(frame, kapasitas), ...] dengan frame header di depan,
+    sisanya berurutan indeks, siap untuk plan_multiframe.
+    """
+    header_capacity = 0
+    heap = []
+    total = 0
+    for frame, capacity in capacities:
+        if frame == header_frame:
+            header_capacity = capacity
+            continue
+        if capacity <= 0:
+            continue
+        heapq.heappush(heap, (capacity, frame))
+        total += capacity
+        # Kebutuhan di luar frame header jika yang terkecil dibuang (header memuat satu entri per frame)
+        while heap:
+            need = payload_len + MULTIFRAME_HEADER.size + MULTIFRAME_ENTRY.size * len(heap) - header_capacity
+            if total - heap[0][0] < need:
+                break
+            total -= heapq.heappop(heap)[0]
+    selected = sorted((frame, capacity) for capacity, frame in heap)
+    return [(header_frame, header_capacity)] + selected
+
+# Fungsi untuk membagi payload menjadi bytes per frame sesuai alokasi
+def split_payload(payload, header, allocation, header_frame=0):
+    chunks = {header_frame: header}
+    for frame, start, end in allocation:
+        chunks[frame] = chunks.get(frame, b'') + payload[start:end]
+    return chunks
+
+# Fungsi untuk menyusun kembali payload dari bytes per frame
+def join_payload(payload_len, allocation, chunks):
+    payload = b''.join(chunks[frame][:end - start] for frame, start, end in sorted(allocation, key=lambda a: a[1]))
+    if len(payload) != payload_len:
+        raise ValueError(f"Payload tidak lengkap: {len(payload)} dari {payload_len} byte.")
+    return payload
+
 # Example usage
 if __name__ == "__main__":
     image_path = os.path.join("input", "original_image.png")
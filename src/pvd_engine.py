@@ -0,0 +1,442 @@
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+from src.pvd_tables import get_table
+
+# Fungsi untuk mengubah bytes menjadi array bit (MSB lebih dulu) dan sebaliknya
+def unpack_bits(data):
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+def pack_bits(bits):
+    whole = (len(bits) // 8) * 8
+    return np.packbits(bits[:whole]).tobytes()
+
+# Fungsi untuk mengambil pasangan piksel (p1, p2) berurutan sebagai array (P, C)
+def pixel_pairs(pixels):
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+    flat = pixels.reshape(-1, channels)
+    n = (flat.shape[0] // 2) * 2
+    return flat[0:n:2], flat[1:n:2]
+
+# Mode pembawa: per channel RGB, grayscale (luminance PIL), atau luma YCoCg-R saja
+MODES = ('rgb', 'gray', 'luma')
+
+def to_gray(pixels):
+    # Sama dengan Image.convert('L') milik PIL (ITU-R 601, fixed point)
+    rgb = pixels.astype(np.int32)
+    return ((rgb[..., 0] * 19595 + rgb[..., 1] * 38470 + rgb[..., 2] * 7471 + 0x8000) >> 16).astype(np.uint8)
+
+def _luma(pixels):
+    # Y dari transformasi reversibel YCoCg-R; mengubah Y sebesar k menggeser R, G, B sebesar k
+    rgb = pixels.astype(np.int32)
+    co = rgb[..., 0] - rgb[..., 2]
+    t = rgb[..., 2] + (co >> 1)
+    cg = rgb[..., 1] - t
+    return rgb, t + (cg >> 1)
+
+def to_carrier(pixels, mode='rgb'):
+    """
+    Bidang piksel tempat bit disisipkan untuk mode tertentu, beserta jendela
+    nilai (batas bawah, batas atas) per piksel atau None untuk 0-255.
+    Jendela mode luma hanya bergantung pada Co/Cg sehingga tidak berubah
+    oleh penyisipan.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode tidak dikenal: {mode}. Pilihan: {', '.join(MODES)}")
+    if mode == 'rgb' or pixels.ndim == 2:
+        return pixels, None
+    if mode == 'gray':
+        return to_gray(pixels), None
+    rgb, y = _luma(pixels)
+    low = y - rgb.min(axis=-1)
+    high = low + 255 - (rgb.max(axis=-1) - rgb.min(axis=-1))
+    return y.astype(np.uint8), (low, high)
+
+def from_carrier(pixels, plane, mode='rgb'):
+    """
+    Menyusun gambar stego dari bidang pembawa hasil penyisipan.
+    """
+    if mode != 'luma' or pixels.ndim == 2:
+        return plane
+    rgb, y = _luma(pixels)
+    return (rgb + (plane.astype(np.int32) - y)[..., None]).astype(np.uint8)
+
+def _bounds(windows):
+    # Jendela nilai per pasangan: (bawah p1, atas p1, bawah p2, atas p2) sebagai array (P, C)
+    if windows is None:
+        return None
+    low1, low2 = pixel_pairs(windows[0])
+    high1, high2 = pixel_pairs(windows[1])
+    return low1, high1, low2, high2
+
+def _flat_bounds(bounds, start=0, stop=None):
+    if bounds is None:
+        return None
+    return tuple(b[start:stop].astype(np.int32).ravel() for b in bounds)
+
+def _slot_bits(d, table, bounds=None):
+    """
+    Kapasitas bit setiap slot. Dengan jendela nilai, slot yang tidak dapat
+    menampung seluruh range selisihnya (ke dua arah) tidak dipakai.
+    """
+    nbits = table.bits[d]
+    if bounds is None:
+        return nbits
+    low1, high1, low2, high2 = bounds
+    lower = table.lower[d]
+    upper = lower + table.width[d] - 1
+    usable = (upper <= np.minimum(high2 - low1, high1 - low2)) & (lower >= np.maximum(low2 - high1, low1 - high2))
+    return np.where(usable, nbits, 0)
+
+# Urutan pasangan pseudo-acak dari kunci: permutasi dibuat sekali per (kunci, jumlah pasangan)
+def _seed(key, *parts):
+    if isinstance(key, str):
+        key = key.encode()
+    digest = hashlib.blake2b(key, digest_size=16, person=b'pvd-order')
+    for part in parts:
+        digest.update(part.to_bytes(8, 'big'))
+    return int.from_bytes(digest.digest(), 'big')
+
+@lru_cache(maxsize=8)
+def pair_order(key, n_pairs):
+    """
+    Permutasi indeks pasangan piksel dari kunci (Generator NumPy, tanpa
+    shuffle di Python). Di-cache per (kunci, jumlah pasangan) sehingga frame
+    berukuran sama memakai permutasi yang sama; hasilnya read-only.
+    """
+    order = np.random.default_rng(_seed(key)).permutation(n_pairs)
+    order.flags.writeable = False
+    return order
+
+def pair_index(key, n_pairs, start, stop, frame=0):
+    """
+    Indeks pasangan ke-start sampai stop dalam urutan kunci. Setiap frame
+    mulai dari offset berbeda (dari kunci dan nomor frame) pada permutasi
+    yang sama, sehingga payload tersebar berbeda antar frame.
+    """
+    if n_pairs == 0:
+        return np.empty(0, dtype=np.intp)
+    offset = _seed(key, frame) % n_pairs
+    return pair_order(key, n_pairs).take(np.arange(offset + start, offset + stop), mode='wrap')
+
+def _pair_view(plane, windows):
+    # View pasangan (P, 2, C) dari bidang pembawa beserta jendela nilai (P, 2)
+    channels = plane.shape[2] if plane.ndim == 3 else 1
+    flat = plane.reshape(-1, channels)
+    n_pairs = flat.shape[0] // 2
+    pairs = flat[:2 * n_pairs].reshape(n_pairs, 2, channels)
+    if windows is not None:
+        windows = tuple(w.reshape(-1)[:2 * n_pairs].reshape(n_pairs, 2) for w in windows)
+    return pairs, windows
+
+def _gather(pairs, windows, index):
+    # Salinan pasangan terpilih sebagai bidang berurutan (1, 2n, C)
+    plane = pairs[index].reshape(1, -1, pairs.shape[2])
+    if windows is not None:
+        windows = tuple(w[index].reshape(1, -1) for w in windows)
+    return plane, windows
+
+# Cache kapasitas frame cover (lihat src/frame_cache.py), nonaktif secara default
+analysis_cache = None
+
+def set_analysis_cache(cache):
+    global analysis_cache
+    analysis_cache = cache
+
+# Fungsi untuk menghitung selisih dan kapasitas bit setiap slot (pasangan x channel)
+def slot_capacity(pixels, table=None, windows=None):
+    table = get_table(table)
+    p1, p2 = pixel_pairs(pixels)
+    p1 = p1.astype(np.int32).ravel()
+    p2 = p2.astype(np.int32).ravel()
+    d = np.abs(p2 - p1)
+    nbits = _slot_bits(d, table, _flat_bounds(_bounds(windows)))
+    return p1, p2, d, nbits
+
+def capacity_bits(pixels, table=None, mode='rgb'):
+    """
+    Total kapasitas bit dari array piksel (HxW atau HxWxC) untuk mode tertentu.
+    """
+    table = get_table(table)
+    plane, windows = to_carrier(pixels, mode)
+    # Kapasitas dengan jendela nilai bergantung pada lebih dari piksel bidang, tidak di-cache
+    cache = analysis_cache if windows is None else None
+    if cache is not None:
+        key = cache.key(plane, table)
+        bits = cache.load(key)
+        if bits is not None:
+            return bits
+    _, _, _, nbits = slot_capacity(plane, table, windows=windows)
+    bits = int(nbits.sum(dtype=np.int64))
+    if cache is not None:
+        cache.store(key, bits)
+    return bits
+
+# Fungsi untuk pembulatan seperti round() Python (half to even) pada a / 2
+def _round_half(a):
+    half = a >> 1
+    return half + ((a & 1) & (half & 1))
+
+def embed_bits(pixels, bitstream, table=None, inplace=False, mode='rgb', key=None, frame=0):
+    """
+    Menyisipkan bitstream (array 0/1) ke salinan array piksel, atau langsung
+    ke array tersebut jika inplace=True (misalnya view np.memmap).
+    Mengembalikan (array stego, jumlah bit yang tersisip). Mode gray
+    menghasilkan gambar grayscale (HxW). Dengan key, pasangan dilalui dalam
+    urutan pseudo-acak (lihat pair_index) alih-alih dari piksel pertama.
+    """
+    plane, windows = to_carrier(pixels, mode)
+    if plane is pixels:
+        return _embed_plane(pixels, bitstream, table, inplace, key=key, frame=frame)
+    if inplace and mode == 'gray':
+        raise ValueError("Mode gray mengubah jumlah channel, tidak dapat disisipkan in-place.")
+    stego_plane, embedded = _embed_plane(plane, bitstream, table, windows=windows, key=key, frame=frame)
+    out = from_carrier(pixels, stego_plane, mode)
+    if inplace:
+        pixels[...] = out
+        out = pixels
+    return out, embedded
+
+def prefix_pairs(pixels, n_bits, table=None, windows=None, chunk_pairs=1024):
+    """
+    Jumlah pasangan piksel awal yang dibutuhkan untuk menampung n_bits,
+    dari kapasitas kumulatif per blok (ukuran blok berlipat dua) sehingga
+    biayanya sebanding dengan panjang payload, bukan ukuran frame.
+    """
+    table = get_table(table)
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+    bounds = _bounds(windows)
+    p1, p2 = pixel_pairs(pixels)
+    have = 0
+    start = 0
+    while start < len(p1):
+        stop = start + chunk_pairs
+        a = p1[start:stop].astype(np.int32).ravel()
+        b = p2[start:stop].astype(np.int32).ravel()
+        ends = np.cumsum(_slot_bits(np.abs(b - a), table, _flat_bounds(bounds, start, stop)), dtype=np.int64)
+        if have + ends[-1] >= n_bits:
+            slot = int(np.searchsorted(ends, n_bits - have, side='left'))
+            return start + slot // channels + 1
+        have += int(ends[-1])
+        start = stop
+        chunk_pairs *= 2
+    return len(p1)
+
+def _embed_keyed(out, bitstream, table, windows, key, frame):
+    """
+    Menyisipkan ke pasangan dalam urutan kunci: prefix urutan yang cukup untuk
+    payload dikumpulkan menjadi bidang berurutan, disisipi, lalu dikembalikan
+    ke posisi asalnya.
+    """
+    pairs, pair_windows = _pair_view(out, windows)
+    n_pairs = len(pairs)
+    total = len(bitstream)
+    count = min(n_pairs, 1024)
+    while True:
+        index = pair_index(key, n_pairs, 0, count, frame)
+        plane, plane_windows = _gather(pairs, pair_windows, index)
+        if count == n_pairs or slot_capacity(plane, table, windows=plane_windows)[3].sum(dtype=np.int64) >= total:
+            break
+        count = min(n_pairs, count * 4)
+    _, embedded = _embed_plane(plane, bitstream, table, True, plane_windows)
+    pairs[index] = plane.reshape(len(index), 2, -1)
+    return embedded
+
+def _embed_plane(pixels, bitstream, table=None, inplace=False, windows=None, key=None, frame=0):
+    table = get_table(table)
+    if inplace:
+        if pixels.dtype != np.uint8 or not pixels.flags.c_contiguous or not pixels.flags.writeable:
+            raise ValueError("Penyisipan in-place membutuhkan array uint8 C-contiguous yang dapat ditulis.")
+        out = pixels
+    else:
+        out = np.array(pixels, dtype=np.uint8, order='C')
+    if key is not None:
+        return out, _embed_keyed(out, bitstream, table, windows, key, frame)
+    channels = out.shape[2] if out.ndim == 3 else 1
+    flat = out.reshape(-1, channels)
+    total = len(bitstream)
+
+    # Analisis hanya prefix pasangan yang dibutuhkan payload; sisa buffer tidak disentuh
+    n_pairs = prefix_pairs(out, total, table, windows)
+    prefix = flat[:2 * n_pairs].reshape(1, -1, channels)
+    if windows is not None:
+        windows = tuple(w.reshape(1, -1)[:, :2 * n_pairs] for w in windows)
+    p1, p2, d, nbits = slot_capacity(prefix, table, windows=windows)
+    ends = np.cumsum(nbits, dtype=np.int64)
+    starts = ends - nbits
+
+    # Slot yang dipakai hanya yang posisi awalnya masih di dalam pesan
+    used = int(np.searchsorted(starts, total, side='left'))
+    if used == 0:
+        return out, 0
+    p1, p2, d, nbits, starts = p1[:used], p2[:used], d[:used], nbits[:used], starts[:used]
+
+    # Padding nol di akhir untuk segmen terakhir yang kurang
+    padded = np.zeros(int(ends[used - 1]) + table.max_bits, dtype=np.int32)
+    fill = min(total, len(padded))
+    padded[:fill] = bitstream[:fill]
+
+    m = np.zeros(used, dtype=np.int32)
+    for j in range(table.max_bits):
+        active = nbits > j
+        m[active] = (m[active] << 1) | padded[starts[active] + j]
+    # Slot tanpa kapasitas (di luar jendela nilai) tidak diubah
+    new_d = np.where(nbits > 0, table.lower[d] + m, d)
+
+    # Hitung nilai piksel baru dengan menjaga rata-rata pasangan
+    up = p2 >= p1
+    p1_new = np.where(up, _round_half(p1 + p2 - new_d), _round_half(p1 + p2 + new_d))
+    p2_new = np.where(up, p1_new + new_d, p1_new - new_d)
+
+    # Validasi batas: geser pasangan ke dalam jendela nilai (default 0-255) tanpa mengubah selisihnya
+    if windows is None:
+        low1 = low2 = 0
+        high1 = high2 = 255
+    else:
+        low1, high1, low2, high2 = _flat_bounds(_bounds(windows))
+        low1, high1, low2, high2 = low1[:used], high1[:used], low2[:used], high2[:used]
+    min_shift = np.maximum(low1 - p1_new, low2 - p2_new)
+    max_shift = np.minimum(high1 - p1_new, high2 - p2_new)
+    shift = np.minimum(np.maximum(min_shift, 0), max_shift)
+    p1_new += shift
+    p2_new += shift
+
+    slots = np.arange(used)
+    pair_slot, channel = slots // channels, slots % channels
+    flat[2 * pair_slot, channel] = p1_new
+    flat[2 * pair_slot + 1, channel] = p2_new
+    return out, min(total, int(ends[used - 1]))
+
+# Tinggi band default (baris) untuk pemrosesan bertahap gambar besar
+BAND_ROWS = 256
+
+def iter_bands(pixels, band_rows=BAND_ROWS):
+    """
+    Generator view band baris (tanpa salinan). Jumlah piksel setiap band
+    dibuat genap sehingga tidak ada pasangan yang melintasi batas band dan
+    urutan slot sama dengan pemrosesan gambar utuh.
+    """
+    if pixels.shape[1] % 2:
+        band_rows += band_rows % 2
+    for top in range(0, pixels.shape[0], band_rows):
+        yield pixels[top:top + band_rows]
+
+def iter_embed_bands(pixels, bitstream, table=None, mode='rgb', band_rows=BAND_ROWS, inplace=False):
+    """
+    Menyisipkan bitstream band demi band; memori sementara sebanding dengan
+    ukuran band. Menghasilkan (band stego, jumlah bit tersisip sejauh ini).
+    """
+    offset = 0
+    for band in iter_bands(pixels, band_rows):
+        stego, embedded = embed_bits(band, bitstream[offset:], table, inplace, mode)
+        offset += embedded
+        yield stego, offset
+
+# Fungsi untuk mengubah selisih slot menjadi array bit berurutan
+def _decode_slots(d, nbits, table):
+    ends = np.cumsum(nbits, dtype=np.int64)
+    starts = ends - nbits
+    m = d - table.lower[d]
+
+    bits = np.empty(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+    for j in range(table.max_bits):
+        active = nbits > j
+        bits[starts[active] + j] = (m[active] >> (nbits[active] - 1 - j)) & 1
+    return bits
+
+def extract_bits(pixels, table=None, mode='rgb'):
+    """
+    Mengekstrak seluruh bit dari array piksel sebagai array 0/1 (uint8).
+    """
+    table = get_table(table)
+    plane, windows = to_carrier(pixels, mode)
+    _, _, d, nbits = slot_capacity(plane, table, windows=windows)
+    return _decode_slots(d, nbits, table)
+
+def iter_bytes(pixels, chunk_pairs=1024, table=None, mode='rgb'):
+    """
+    Generator byte hasil ekstraksi, didekode per blok pasangan piksel.
+    Ukuran blok berlipat dua setiap iterasi sehingga pesan pendek hanya
+    membaca awal frame. Sisa bit yang tidak genap satu byte diabaikan.
+    """
+    table = get_table(table)
+    plane, windows = to_carrier(pixels, mode)
+    bounds = _bounds(windows)
+    p1, p2 = pixel_pairs(plane)
+    carry = np.empty(0, dtype=np.uint8)
+    start = 0
+    while start < len(p1):
+        stop = start + chunk_pairs
+        a = p1[start:stop].astype(np.int32).ravel()
+        b = p2[start:stop].astype(np.int32).ravel()
+        d = np.abs(b - a)
+        nbits = _slot_bits(d, table, _flat_bounds(bounds, start, stop))
+        bits = np.concatenate([carry, _decode_slots(d, nbits, table)])
+        whole = (len(bits) // 8) * 8
+        if whole:
+            yield pack_bits(bits)
+        carry = bits[whole:]
+        start = stop
+        chunk_pairs *= 2
+
+def read_bits(pixels, n_bits, chunk_pairs=1024, table=None, mode='rgb', band_rows=None, key=None, frame=0):
+    """
+    Mengekstrak tepat n_bits pertama. Pasangan piksel didekode per blok dan
+    berhenti di slot terakhir yang dibutuhkan (dari kapasitas kumulatif).
+    Dengan band_rows, gambar dibaca per band sehingga memori tetap terbatas.
+    Dengan key, pasangan dibaca dalam urutan yang sama dengan embed_bits.
+    """
+    table = get_table(table)
+    if band_rows and key is not None:
+        raise ValueError("Urutan pasangan dengan kunci mencakup seluruh frame, tidak dapat dibaca per band.")
+    if band_rows:
+        parts = []
+        have = 0
+        for band in iter_bands(pixels, band_rows):
+            if have >= n_bits:
+                break
+            bits = read_bits(band, n_bits - have, chunk_pairs, table, mode)
+            parts.append(bits)
+            have += len(bits)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint8)
+    plane, windows = to_carrier(pixels, mode)
+    if key is None:
+        return _read_plane(plane, windows, n_bits, chunk_pairs, table)
+
+    # Kumpulkan blok urutan kunci secara bertahap; tiap blok dibaca seperti bidang berurutan
+    pairs, pair_windows = _pair_view(plane, windows)
+    parts = []
+    have = 0
+    start = 0
+    while have < n_bits and start < len(pairs):
+        stop = min(len(pairs), start + chunk_pairs)
+        block, block_windows = _gather(pairs, pair_windows, pair_index(key, len(pairs), start, stop, frame))
+        bits = _read_plane(block, block_windows, n_bits - have, chunk_pairs, table)
+        parts.append(bits)
+        have += len(bits)
+        start = stop
+        chunk_pairs *= 2
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint8)
+
+def _read_plane(plane, windows, n_bits, chunk_pairs, table):
+    bounds = _bounds(windows)
+    p1, p2 = pixel_pairs(plane)
+    parts = []
+    have = 0
+    start = 0
+    while have < n_bits and start < len(p1):
+        stop = start + chunk_pairs
+        a = p1[start:stop].astype(np.int32).ravel()
+        b = p2[start:stop].astype(np.int32).ravel()
+        d = np.abs(b - a)
+        nbits = _slot_bits(d, table, _flat_bounds(bounds, start, stop))
+        used = int(np.searchsorted(np.cumsum(nbits), n_bits - have, side='left')) + 1
+        bits = _decode_slots(d[:used], nbits[:used], table)
+        parts.append(bits)
+        have += len(bits)
+        start = stop
+        chunk_pairs *= 2
+    bits = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint8)
+    return bits[:n_bits]
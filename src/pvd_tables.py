@@ -0,0 +1,60 @@
+import numpy as np
+
+class RangeTable:
+    """
+    Tabel range kuantisasi PVD beserta lookup table 256 entri
+    (batas bawah, lebar, dan jumlah bit untuk setiap nilai selisih).
+    """
+    def __init__(self, name, ranges):
+        expected = 0
+        for (lower, upper) in ranges:
+            width = upper - lower + 1
+            if lower != expected or width & (width - 1):
+                raise ValueError(f"Range tidak valid pada tabel {name}: {(lower, upper)}")
+            expected = upper + 1
+        if expected != 256:
+            raise ValueError(f"Tabel {name} harus mencakup selisih 0-255.")
+
+        self.name = name
+        self.ranges = list(ranges)
+        self.lower = np.zeros(256, dtype=np.int32)
+        self.width = np.zeros(256, dtype=np.int32)
+        self.bits = np.zeros(256, dtype=np.int32)
+        for (lower, upper) in ranges:
+            width = upper - lower + 1
+            self.lower[lower:upper + 1] = lower
+            self.width[lower:upper + 1] = width
+            self.bits[lower:upper + 1] = width.bit_length() - 1
+        self.max_bits = int(self.bits.max())
+
+    def lookup(self, d):
+        lower = int(self.lower[d])
+        return (lower, lower + int(self.width[d]) - 1, int(self.bits[d]))
+
+    def __repr__(self):
+        return f"RangeTable({self.name!r})"
+
+# Tabel asli Wu-Tsai (default, sama dengan get_range_and_bits lama)
+WU_TSAI = RangeTable('wu-tsai', [(0, 7), (8, 15), (16, 31), (32, 63), (64, 127), (128, 255)])
+
+# Varian Wu-Tsai dengan range sempit di area halus (distorsi lebih kecil)
+WU_TSAI_FINE = RangeTable('wu-tsai-fine', [(0, 1), (2, 3), (4, 7), (8, 15), (16, 31), (32, 63), (64, 127), (128, 255)])
+
+# Range seragam: 3 bit (lebar 8) dan 4 bit (lebar 16) per slot
+UNIFORM_3BIT = RangeTable('uniform-3bit', [(i, i + 7) for i in range(0, 256, 8)])
+UNIFORM_4BIT = RangeTable('uniform-4bit', [(i, i + 15) for i in range(0, 256, 16)])
+
+TABLES = {table.name: table for table in (WU_TSAI, WU_TSAI_FINE, UNIFORM_3BIT, UNIFORM_4BIT)}
+DEFAULT_TABLE = WU_TSAI
+
+def get_table(table=None):
+    """
+    Mengambil RangeTable dari nama, objek RangeTable, atau None (default).
+    """
+    if table is None:
+        return DEFAULT_TABLE
+    if isinstance(table, RangeTable):
+        return table
+    if table not in TABLES:
+        raise ValueError(f"Tabel range tidak dikenal: {table}. Pilihan: {', '.join(TABLES)}")
+    return TABLES[table]
@@ -1,12 +1,19 @@
 import os
 from Crypto.PublicKey import RSA
-from Crypto.Cipher import PKCS1_OAEP
+from Crypto.Cipher import AES, PKCS1_OAEP
+from Crypto.Random import get_random_bytes
 import base64
+import binascii
 from colorama import init, Fore, Style
 
 PRIVATE_KEY_PATH = os.path.join("keys", "private_key.pem")
 PUBLIC_KEY_PATH = os.path.join("keys", "public_key.pem")
 
+# Parameter enkripsi hibrida (AES-256-GCM)
+SESSION_KEY_SIZE = 32
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
 def generate_rsa_keys(key_size=2048):
     if not os.path.exists("keys"):
         os.makedirs("keys")
@@ -26,25 +33,126 @@ def generate_rsa_keys(key_size=2048):
     
     return private_key, public_key
 
+class KeyRing:
+    """
+    Memuat kunci RSA sekali dan menyimpan kunci serta objek cipher di cache.
+    Cache dimuat ulang otomatis jika mtime atau ukuran file kunci berubah.
+    """
+    def __init__(self, private_key_path=PRIVATE_KEY_PATH, public_key_path=PUBLIC_KEY_PATH):
+        self.private_key_path = private_key_path
+        self.public_key_path = public_key_path
+        self._cache = {}
+
+    def _load(self, path):
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, "r") as key_file:
+                key = RSA.import_key(key_file.read())
+            cached = (version, key, PKCS1_OAEP.new(key))
+            self._cache[path] = cached
+        return cached
+
+    def clear(self):
+        self._cache.clear()
+
+    def public_key(self):
+        return self._load(self.public_key_path)[1]
+
+    def private_key(self):
+        return self._load(self.private_key_path)[1]
+
+    def encrypt_base64(self, message: str) -> str:
+        encrypted = self._load(self.public_key_path)[2].encrypt(message.encode())
+        return base64.b64encode(encrypted).decode()
+
+    def decrypt_base64(self, encrypted_base64: str) -> str:
+        decrypted = self._load(self.private_key_path)[2].decrypt(base64.b64decode(encrypted_base64))
+        return decrypted.decode()
+
+    def encrypt_hybrid(self, message) -> bytes:
+        data = message.encode() if isinstance(message, str) else message
+        session_key = get_random_bytes(SESSION_KEY_SIZE)
+        wrapped_key = self._load(self.public_key_path)[2].encrypt(session_key)
+        cipher = AES.new(session_key, AES.MODE_GCM, nonce=get_random_bytes(NONCE_SIZE))
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        return wrapped_key + cipher.nonce + tag + ciphertext
+
+    def decrypt_hybrid(self, encrypted: bytes) -> bytes:
+        _, private_key, rsa_cipher = self._load(self.private_key_path)
+        key_size = private_key.size_in_bytes()
+        if len(encrypted) < key_size + NONCE_SIZE + TAG_SIZE:
+            raise ValueError("Data terenkripsi terlalu pendek.")
+        wrapped_key = encrypted[:key_size]
+        nonce = encrypted[key_size:key_size + NONCE_SIZE]
+        tag = encrypted[key_size + NONCE_SIZE:key_size + NONCE_SIZE + TAG_SIZE]
+        ciphertext = encrypted[key_size + NONCE_SIZE + TAG_SIZE:]
+        session_key = rsa_cipher.decrypt(wrapped_key)
+        cipher = AES.new(session_key, AES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(ciphertext, tag)
+
+    def encrypt_batch(self, messages, hybrid=False):
+        encrypt = self.encrypt_hybrid if hybrid else self.encrypt_base64
+        return [encrypt(message) for message in messages]
+
+    def decrypt_batch(self, encrypted_messages, hybrid=False):
+        decrypt = self.decrypt_hybrid if hybrid else self.decrypt_base64
+        return [decrypt(encrypted) for encrypted in encrypted_messages]
+
+# Key ring bersama untuk fungsi-fungsi modul di bawah
+default_keyring = KeyRing()
+
+def load_public_key():
+    return default_keyring.public_key()
+
+def load_private_key():
+    return default_keyring.private_key()
+
 def encrypt_message_base64(message: str) -> str:
     """
     Enkripsi pesan menggunakan kunci publik RSA dan hasil base64.
     """
-    with open(PUBLIC_KEY_PATH, "r") as public_file:
-        public_key_pem = public_file.read()
-        
-    public_key = RSA.import_key(public_key_pem)
-    cipher = PKCS1_OAEP.new(public_key)
-    encrypted = cipher.encrypt(message.encode())
-    return base64.b64encode(encrypted).decode()
+    return default_keyring.encrypt_base64(message)
 
 def decrypt_message_base64(encrypted_base64: str) -> str:
     """
     Dekripsi pesan base64 menggunakan kunci privat RSA.
     """
-    with open(PRIVATE_KEY_PATH, "r") as private_file:
-        private_key_pem = private_file.read()
-    private_key = RSA.import_key(private_key_pem)
-    cipher = PKCS1_OAEP.new(private_key)
-    decrypted = cipher.decrypt(base64.b64decode(encrypted_base64))
-    return decrypted.decode()
+    return default_keyring.decrypt_base64(encrypted_base64)
+
+def encrypt_message_hybrid(message) -> bytes:
+    """
+    Enkripsi hibrida untuk pesan berukuran bebas: kunci sesi AES-GCM acak
+    dibungkus RSA-OAEP. Hasil biner: kunci terbungkus | nonce | tag | ciphertext.
+    """
+    return default_keyring.encrypt_hybrid(message)
+
+def decrypt_message_hybrid(encrypted: bytes) -> bytes:
+    """
+    Dekripsi hasil encrypt_message_hybrid menggunakan kunci privat RSA.
+    """
+    return default_keyring.decrypt_hybrid(encrypted)
+
+def decrypt_message(encrypted: bytes) -> str:
+    """
+    Dekripsi payload hasil ekstraksi: format hibrida biner, atau base64
+    RSA langsung untuk stego lama.
+    """
+    try:
+        return decrypt_message_hybrid(encrypted).decode()
+    except ValueError:
+        # Hanya payload base64 sepanjang ciphertext RSA yang dianggap format lama
+        if not is_legacy_base64(encrypted):
+            raise
+    return decrypt_message_base64(encrypted.decode())
+
+def is_legacy_base64(encrypted: bytes) -> bool:
+    key_size = load_private_key().size_in_bytes()
+    if len(encrypted) != 4 * -(-key_size // 3):
+        return False
+    try:
+        base64.b64decode(encrypted, validate=True)
+    except binascii.Error:
+        return False
+    return True
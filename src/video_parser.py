@@ -1,5 +1,9 @@
 import cv2
 import os
+import shutil
+import subprocess
+
+from src.frame_store import FrameStore
 
 def extract_frames(video_path = 'input_video.mp4', frames_dir = 'frames'):
     if not os.path.exists(frames_dir):
@@ -42,6 +46,175 @@ def combine_frames_to_video(frames_dir, output_video_path, fps=30):
     out.release()
     print(f"Video lossless berhasil dibuat: {output_video_path}")
 
+# Generator frame (BGR) langsung dari cv2.VideoCapture tanpa file perantara
+def iter_frames(video_path):
+    cap = cv2.VideoCapture(video_path)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        cap.release()
+
+def video_info(video_path):
+    """
+    Metadata video dari container: jumlah frame, fps, lebar, dan tinggi.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return {
+            "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            "fps": cap.get(cv2.CAP_PROP_FPS),
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        }
+    finally:
+        cap.release()
+
+# Generator (indeks, frame BGR) mulai dari frame tertentu sampai akhir video
+def iter_frames_from(video_path, start=0):
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        index = start
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield index, frame
+            index += 1
+    finally:
+        cap.release()
+
+# Selisih indeks minimal sebelum memakai seek, jarak dekat cukup dilewati dengan grab()
+SEEK_THRESHOLD = 50
+
+def iter_selected_frames(video_path, indices):
+    """
+    Generator (indeks, frame BGR) hanya untuk indeks tertentu tanpa
+    mendekode seluruh video; indeks di luar video dilewati.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        position = 0
+        for index in sorted(set(indices)):
+            if index - position > SEEK_THRESHOLD:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                position = index
+            while position < index:
+                if not cap.grab():
+                    return
+                position += 1
+            ret, frame = cap.read()
+            if not ret:
+                return
+            yield index, frame
+            position += 1
+    finally:
+        cap.release()
+
+def read_frames(video_path, indices):
+    return dict(iter_selected_frames(video_path, indices))
+
+def read_frame(video_path, index=0):
+    return read_frames(video_path, [index]).get(index)
+
+def to_rgb(frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+def to_bgr(pixels):
+    return cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR)
+
+def write_video(frames, output_video_path, fps=30):
+    """
+    Menulis iterable frame BGR langsung ke VideoWriter (FFV1).
+    Mengembalikan jumlah frame yang ditulis. Jika iterable gagal atau
+    dibatalkan, file yang belum selesai dihapus.
+    """
+    out = None
+    count = 0
+    try:
+        for frame in frames:
+            if out is None:
+                height, width = frame.shape[:2]
+                fourcc = cv2.VideoWriter_fourcc(*'FFV1')  # Codec lossless
+                out = cv2.VideoWriter(output_video_path, fourcc, fps, (width, height))
+            out.write(frame)
+            if count % 100 == 0:
+                print(f"Menulis frame {count} ke {output_video_path}")
+            count += 1
+    except BaseException:
+        if out is not None:
+            out.release()
+            if os.path.exists(output_video_path):
+                os.remove(output_video_path)
+        raise
+    if out is None:
+        print("Tidak ada frame ditemukan di video.")
+        return 0
+    out.release()
+    print(f"Video lossless berhasil dibuat: {output_video_path} ({count} frames)")
+    return count
+
+def source_fps(video_path, default=30):
+    return video_info(video_path)["fps"] or default
+
+FFMPEG = shutil.which("ffmpeg")
+
+def mux_audio(video_only_path, source_path, output_video_path):
+    """
+    Menggabungkan stream video stego dengan audio video sumber tanpa re-encode
+    (-c copy). Jika ffmpeg tidak ada atau gagal, video disimpan tanpa audio.
+    """
+    if FFMPEG is not None:
+        command = [
+            FFMPEG, "-y", "-loglevel", "error",
+            "-i", video_only_path, "-i", source_path,
+            "-map", "0:v:0", "-map", "1:a?", "-c", "copy",
+            output_video_path,
+        ]
+        if subprocess.run(command).returncode == 0:
+            os.remove(video_only_path)
+            return True
+        print("Gagal menyalin audio dengan ffmpeg, video disimpan tanpa audio.")
+    else:
+        print("ffmpeg tidak ditemukan, video disimpan tanpa audio.")
+    os.replace(video_only_path, output_video_path)
+    return False
+
+def remux_video(video_path, output_video_path, frames=None, keep_audio=True):
+    """
+    Mode output remux: frame (default: langsung dari video_path) ditulis dengan
+    FPS sumber, lalu audio sumber disalin tanpa re-encode. Frame yang tidak
+    diubah diteruskan dari decoder tanpa konversi warna maupun PVD.
+    """
+    if frames is None:
+        frames = iter_frames(video_path)
+    fps = source_fps(video_path)
+    if not keep_audio:
+        return write_video(frames, output_video_path, fps)
+    root, ext = os.path.splitext(output_video_path)
+    video_only_path = f"{root}.video{ext}"
+    count = write_video(frames, video_only_path, fps)
+    if count:
+        mux_audio(video_only_path, video_path, output_video_path)
+    return count
+
+def extract_frames_to_store(video_path, store_path):
+    """
+    Menyimpan semua frame video (RGB) ke satu file FrameStore tanpa kompresi.
+    """
+    fps = video_info(video_path)["fps"] or 30
+    store = FrameStore.write(store_path, (to_rgb(frame) for frame in iter_frames(video_path)), fps)
+    print(f"{len(store)} frames berhasil disimpan ke {store_path}")
+    return store
+
+def store_to_video(store, output_video_path, fps=None):
+    return write_video((to_bgr(frame) for frame in store), output_video_path, fps or store.fps)
+
 if __name__ == "__main__":
     video_path = os.path.join('input', 'original_video.mp4')
     frames_dir = os.path.join('input', 'frames')